@@ -4,10 +4,111 @@ CORE COMPONENT: API Contract Registry
 Central contract management for cross-handler communication
 """
 
+import atexit
+import copyreg
+import hashlib
+import logging
+import os
+import queue
+import sys
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Sequence, Set, Tuple
+
+import orjson
+
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+class _BackgroundWriter:
+    """Single daemon thread that persists registry files off the caller's path"""
+    
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+    
+    def submit(self, path: Path, payload: bytes, on_error: Optional[Callable[[], None]] = None):
+        """Queue a file write; later writes to the same path supersede earlier ones.
+        on_error runs on the writer thread if the write that carries this payload fails"""
+        if self._thread is None:
+            self._start()
+        self._queue.put((path, payload, on_error))
+    
+    def flush(self):
+        """Block until every write queued so far has reached disk"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+    
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="contract-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            
+            # Drain everything queued, coalescing writes to the same path; a superseded
+            # payload's error callback still fires if the write that replaced it fails
+            pending: Dict[Path, Tuple[bytes, List[Callable[[], None]]]] = {}
+            waiters: List[threading.Event] = []
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    path, payload, on_error = item
+                    callbacks = pending[path][1] if path in pending else []
+                    if on_error is not None:
+                        callbacks.append(on_error)
+                    pending[path] = (payload, callbacks)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            for path, (payload, callbacks) in pending.items():
+                try:
+                    self._write_atomic(path, payload)
+                except Exception as e:
+                    logger.error(f"❌ Failed to persist {path}: {e}")
+                    for on_error in callbacks:
+                        on_error()
+            
+            for waiter in waiters:
+                waiter.set()
+    
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes):
+        """Write to a temp file and rename over the target, so readers never see a partial file"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+
+_writer = _BackgroundWriter()
+atexit.register(_writer.flush)
+
+# Below this many contracts, process pool startup costs more than it saves
+_PARALLEL_DUMP_THRESHOLD = 64
+
+@dataclass(slots=True)
 class APIEndpoint:
     """Structured API endpoint definition"""
     method: str
@@ -19,26 +120,51 @@ class APIEndpoint:
     description: str = ""
     handler_type: str = "backend"
 
-@dataclass
+@dataclass(slots=True)
 class DataModel:
     """Structured data model definition"""
     name: str
     schema: Dict[str, Any]
-    relationships: List[str] = None
-    table_name: str = None
-    indexes: List[str] = None
-    constraints: List[str] = None
+    relationships: List[str] = field(default_factory=list)
+    table_name: Optional[str] = None
+    indexes: List[str] = field(default_factory=list)
+    constraints: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class FeatureContract:
     """Complete contract for a feature"""
     feature_name: str
     endpoints: List[APIEndpoint]
     models: List[DataModel]
-    dependencies: List[str] = None
-    security_requirements: List[str] = None
-    created_by: str = None
-    created_at: str = None
+    dependencies: List[str] = field(default_factory=list)
+    security_requirements: List[str] = field(default_factory=list)
+    created_by: Optional[str] = None
+    created_at: Optional[str] = None
+
+def _json_default(value: Any) -> Any:
+    """orjson fallback for the read-only schema views the registry shares between endpoints"""
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def _freeze(value: Any) -> Any:
+    """Private deep copy of a schema value: dicts become read-only views, lists become tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _schema_view(schema: Dict[str, Any]) -> Mapping[str, Any]:
+    """Rebuild a read-only schema view after unpickling"""
+    return MappingProxyType(schema)
+
+# Let contracts holding pooled schema views cross into dump_all's worker processes
+copyreg.pickle(MappingProxyType, lambda view: (_schema_view, (dict(view),)))
+
+def _encode_one(contract: "FeatureContract") -> Tuple[str, bytes]:
+    """Encode one contract for export (module-level so worker processes can pickle it)"""
+    return contract.feature_name, orjson.dumps(contract, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
 
 class APIContractRegistry:
     """Central registry for all API contracts"""
@@ -54,6 +180,41 @@ class APIContractRegistry:
         self.model_registry: Dict[str, DataModel] = {}
         self.dependency_graph: Dict[str, Set[str]] = {}
         
+        # Contracts persisted by an earlier run in this project path, parsed on first access only
+        self._lazy_contract_paths: Dict[str, Path] = {
+            path.name[:-len("_contract.json")]: path
+            for path in sorted(self.contracts_path.glob("*_contract.json"))
+        }
+        
+        # Read-only view handed out to handlers instead of the live dict
+        self._contracts_view = MappingProxyType(self.feature_contracts)
+        
+        # Reverse index: handler_type -> {"METHOD path": endpoint}
+        self.endpoints_by_handler: Dict[str, Dict[str, APIEndpoint]] = defaultdict(dict)
+        
+        # Number of registered endpoints per path, for duplicate detection
+        self._path_counts: Counter = Counter()
+        
+        # Digest of the last payload written per feature, to skip unchanged writes
+        self._contract_hashes: Dict[str, bytes] = {}
+        
+        # Content-addressed pool so identical schemas share one read-only view
+        self._schema_pool: Dict[bytes, Mapping[str, Any]] = {}
+        
+        # dependency_graph over integer node ids, kept up to date as contracts are indexed:
+        # every feature or dependency name gets an id, _dep_edges[id] holds its dependencies' ids
+        self._node_ids: Dict[str, int] = {}
+        self._node_names: List[str] = []
+        self._dep_edges: List[array] = []
+        
+        # Cycle detection result, cached until the dependency graph changes
+        self._graph_version = 0
+        self._cycle_cache: Optional[Tuple[int, Set[str]]] = None
+        
+        # Bumped by every mutation; handler contexts are cached per version
+        self._version = 0
+        self._ctx_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        
         # Context preservation for Claude
         self.generation_context: Dict[str, Any] = {
             "established_patterns": [],
@@ -65,37 +226,146 @@ class APIContractRegistry:
     
     def register_feature_contract(self, contract: FeatureContract):
         """Register complete contract for a feature"""
-        contract.created_at = datetime.utcnow().isoformat()
+        if self._index_contract(contract):
+            self._graph_version += 1
+        
+        # Persist to disk
+        self._save_contract_to_disk(contract)
+        
+        logger.info(f"✅ Registered contract for feature: {contract.feature_name}")
+    
+    def bulk_register(self, contracts: Sequence[FeatureContract]):
+        """Register many contracts at once (e.g. when recovering from disk)"""
+        graph_changed = False
+        for contract in contracts:
+            graph_changed |= self._index_contract(contract)
+            self._save_contract_to_disk(contract)
+        
+        # One cycle-cache invalidation for the whole batch instead of one per contract
+        if graph_changed:
+            self._graph_version += 1
+        
+        logger.info(f"✅ Registered {len(contracts)} contracts")
+    
+    def _index_contract(self, contract: FeatureContract) -> bool:
+        """Add a contract to the in-memory indexes; returns True if the dependency graph changed"""
+        self._bump_version()
+        # A registered contract supersedes any persisted copy not yet loaded
+        self._lazy_contract_paths.pop(contract.feature_name, None)
+        
+        # Keep the original timestamp when an identical contract is re-registered
+        previous = self.feature_contracts.get(contract.feature_name)
+        contract.created_at = previous.created_at if previous else None
+        if contract != previous:
+            contract.created_at = datetime.utcnow().isoformat()
         self.feature_contracts[contract.feature_name] = contract
         
-        # Index endpoints
+        # Index endpoints (method/handler_type come from a tiny vocabulary, so intern them)
         for endpoint in contract.endpoints:
+            endpoint.method = sys.intern(endpoint.method)
+            endpoint.handler_type = sys.intern(endpoint.handler_type)
+            endpoint.input_schema = self._pool_schema(endpoint.input_schema)
+            endpoint.output_schema = self._pool_schema(endpoint.output_schema)
             key = f"{endpoint.method} {endpoint.path}"
+            replaced = self.endpoint_registry.get(key)
+            if replaced is None:
+                self._path_counts[endpoint.path] += 1
+            elif replaced.handler_type != endpoint.handler_type:
+                del self.endpoints_by_handler[replaced.handler_type][key]
             self.endpoint_registry[key] = endpoint
+            self.endpoints_by_handler[endpoint.handler_type][key] = endpoint
         
         # Index models
         for model in contract.models:
+            if model.table_name:
+                model.table_name = sys.intern(model.table_name)
+            model.schema = self._pool_schema(model.schema)
             self.model_registry[model.name] = model
         
         # Build dependency graph
         if contract.dependencies:
-            self.dependency_graph[contract.feature_name] = set(contract.dependencies)
-        
-        # Persist to disk
-        self._save_contract_to_disk(contract)
-        
-        logger.info(f"✅ Registered contract for feature: {contract.feature_name}")
+            dependencies = set(contract.dependencies)
+            self.dependency_graph[contract.feature_name] = dependencies
+            node = self._node_id(contract.feature_name)
+            self._dep_edges[node] = array('i', [self._node_id(dep) for dep in dependencies])
+            return True
+        return False
+    
+    def _node_id(self, name: str) -> int:
+        """Integer id of a feature in the dependency graph, assigned on first sight"""
+        node = self._node_ids.get(name)
+        if node is None:
+            node = self._node_ids[name] = len(self._node_names)
+            self._node_names.append(name)
+            self._dep_edges.append(array('i'))
+        return node
+    
+    def _pool_schema(self, schema: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Return the shared read-only view of a schema with the same canonical content"""
+        try:
+            canonical = orjson.dumps(
+                schema, default=_json_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            # Schemas orjson can't canonicalize are kept as given, just not shared
+            return schema
+        digest = hashlib.blake2b(canonical, digest_size=16).digest()
+        pooled = self._schema_pool.get(digest)
+        if pooled is None:
+            # Shared between endpoints and keyed by content, so pool a deep-frozen private copy:
+            # neither the caller's dict nor anything nested in it can change the pooled schema
+            pooled = _freeze(schema)
+            self._schema_pool[digest] = pooled
+        return pooled
+    
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever registry contents or generation context change"""
+        return self._version
+    
+    def _bump_version(self):
+        self._version += 1
+        self._ctx_cache.clear()
     
     def get_feature_contract(self, feature_name: str) -> Optional[FeatureContract]:
-        """Get contract for specific feature"""
-        return self.feature_contracts.get(feature_name)
+        """Get contract for specific feature, loading a persisted one on first access"""
+        contract = self.feature_contracts.get(feature_name)
+        if contract is None and feature_name in self._lazy_contract_paths:
+            contract = self._load_contract_from_disk(self._lazy_contract_paths[feature_name])
+        return contract
+    
+    def get_feature_contracts(self, feature_names: Sequence[str]) -> Dict[str, FeatureContract]:
+        """Get contracts for several features at once, in request order, skipping unknown features"""
+        registered = self.feature_contracts
+        lazy = self._lazy_contract_paths
+        contracts = {}
+        for feature_name in feature_names:
+            contract = registered.get(feature_name)
+            if contract is None and feature_name in lazy:
+                contract = self._load_contract_from_disk(lazy[feature_name])
+            if contract is not None:
+                contracts[feature_name] = contract
+        return contracts
+    
+    def recover(self) -> int:
+        """Load every persisted contract not yet parsed; returns how many were loaded"""
+        if not self._lazy_contract_paths:
+            return 0
+        loaded = sum(
+            self._load_contract_from_disk(contract_file) is not None
+            for contract_file in list(self._lazy_contract_paths.values())
+        )
+        logger.info(f"📂 Recovered {loaded} contracts from {self.contracts_path}")
+        return loaded
     
     def get_all_endpoints(self) -> List[APIEndpoint]:
         """Get all registered endpoints"""
+        self.recover()
         return list(self.endpoint_registry.values())
     
     def get_all_models(self) -> List[DataModel]:
         """Get all registered data models"""
+        self.recover()
         return list(self.model_registry.values())
     
     def validate_cross_stack_consistency(self) -> Dict[str, List[str]]:
@@ -106,32 +376,40 @@ class APIContractRegistry:
             "dependency_conflicts": [],
             "naming_conflicts": []
         }
+        self.recover()
         
         # Check for naming conflicts
-        endpoint_paths = [ep.path for ep in self.endpoint_registry.values()]
-        if len(endpoint_paths) != len(set(endpoint_paths)):
-            issues["naming_conflicts"].append("Duplicate endpoint paths detected")
+        for path, count in self._path_counts.items():
+            if count > 1:
+                issues["naming_conflicts"].append(f"Duplicate endpoint path detected: {path}")
         
         # Check dependency cycles
-        for feature, deps in self.dependency_graph.items():
-            if self._has_circular_dependency(feature, deps):
+        cyclic_features = self._find_cycles()
+        for feature in self.dependency_graph:
+            if feature in cyclic_features:
                 issues["dependency_conflicts"].append(f"Circular dependency in {feature}")
         
         return issues
     
     def get_context_for_handler(self, handler_type: str, feature: str) -> Dict[str, Any]:
-        """Get relevant context for specific handler"""
-        context = {
-            "feature": feature,
-            "existing_contracts": self.feature_contracts,
-            "established_patterns": self.generation_context["established_patterns"],
-            "architectural_decisions": self.generation_context["architectural_decisions"],
-            "related_endpoints": [ep for ep in self.endpoint_registry.values() 
-                                if ep.handler_type == handler_type],
-            "related_models": [model for model in self.model_registry.values()],
-            "naming_conventions": self.generation_context["naming_conventions"]
-        }
-        return context
+        """Get relevant context for specific handler (cached until the next registration or context update)"""
+        # Aggregates below must include persisted contracts nobody has looked up yet
+        self.recover()
+        key = (handler_type, feature)
+        context = self._ctx_cache.get(key)
+        if context is None:
+            context = {
+                "feature": feature,
+                "existing_contracts": self._contracts_view,
+                "established_patterns": self.generation_context["established_patterns"],
+                "architectural_decisions": self.generation_context["architectural_decisions"],
+                "related_endpoints": tuple(self.endpoints_by_handler.get(handler_type, {}).values()),
+                "related_models": self.model_registry.values(),
+                "naming_conventions": self.generation_context["naming_conventions"]
+            }
+            self._ctx_cache[key] = context
+        # Callers get their own copy, so edits to it can't leak into the next handler's context
+        return dict(context)
     
     def update_generation_context(self, updates: Dict[str, Any]):
         """Update context for future generations"""
@@ -141,39 +419,134 @@ class APIContractRegistry:
                     self.generation_context[key].extend(value)
                 else:
                     self.generation_context[key].update(value)
+        self._bump_version()
         
         # Persist context
         context_file = self.contracts_path / "generation_context.json"
-        context_file.write_text(json.dumps(self.generation_context, indent=2))
+        _writer.submit(context_file, orjson.dumps(self.generation_context, option=orjson.OPT_INDENT_2))
+    
+    def flush(self):
+        """Wait for pending contract/context writes to reach disk"""
+        _writer.flush()
+    
+    def export_contract_json(self, feature_name: str) -> Optional[str]:
+        """Pretty-printed JSON of a registered contract, for human review"""
+        contract = self.get_feature_contract(feature_name)
+        if contract is None:
+            return None
+        return orjson.dumps(contract, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    
+    def dump_all(self, directory: str) -> int:
+        """Export every contract as pretty JSON into directory; returns the number written"""
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        self.recover()
+        contracts = list(self.feature_contracts.values())
+        
+        # Encoding is CPU-bound, so large exports fan out across processes;
+        # the background writer overlaps the file writes with the remaining encoding
+        if len(contracts) < _PARALLEL_DUMP_THRESHOLD:
+            for feature_name, payload in map(_encode_one, contracts):
+                _writer.submit(target / f"{feature_name}_contract.json", payload)
+        else:
+            with ProcessPoolExecutor() as executor:
+                for feature_name, payload in executor.map(_encode_one, contracts, chunksize=16):
+                    _writer.submit(target / f"{feature_name}_contract.json", payload)
+        
+        _writer.flush()
+        logger.info(f"📦 Exported {len(contracts)} contracts to {target}")
+        return len(contracts)
     
     def _save_contract_to_disk(self, contract: FeatureContract):
-        """Persist contract to disk for recovery"""
+        """Persist contract to disk for recovery (written by the background writer)"""
         contract_file = self.contracts_path / f"{contract.feature_name}_contract.json"
-        contract_data = {
-            "feature_name": contract.feature_name,
-            "endpoints": [asdict(ep) for ep in contract.endpoints],
-            "models": [asdict(model) for model in contract.models],
-            "dependencies": contract.dependencies,
-            "security_requirements": contract.security_requirements,
-            "created_by": contract.created_by,
-            "created_at": contract.created_at
-        }
-        contract_file.write_text(json.dumps(contract_data, indent=2))
+        # Recovery files are machine-read: compact output, no indentation.
+        # orjson serializes the dataclass tree natively, no intermediate asdict() copy
+        payload = orjson.dumps(contract, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        
+        # Skip the write when the content matches what is already on disk
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if self._contract_hashes.get(contract.feature_name) == digest:
+            return
+        
+        # Recorded up front so repeat saves skip while the write is queued; a failed write
+        # forgets the digest again, so the next identical save retries it
+        feature_name = contract.feature_name
+        self._contract_hashes[feature_name] = digest
+        
+        def forget_digest():
+            if self._contract_hashes.get(feature_name) == digest:
+                del self._contract_hashes[feature_name]
+        
+        _writer.submit(contract_file, payload, forget_digest)
     
-    def _has_circular_dependency(self, feature: str, dependencies: Set[str], 
-                                visited: Set[str] = None) -> bool:
-        """Check for circular dependencies"""
-        if visited is None:
-            visited = set()
+    def _load_contract_from_disk(self, contract_file: Path) -> Optional[FeatureContract]:
+        """Parse a persisted contract and index it without writing it back"""
+        self._lazy_contract_paths.pop(contract_file.name[:-len("_contract.json")], None)
+        try:
+            payload = contract_file.read_bytes()
+            data = orjson.loads(payload)
+            data["endpoints"] = [APIEndpoint(**endpoint) for endpoint in data["endpoints"]]
+            data["models"] = [DataModel(**model) for model in data["models"]]
+            contract = FeatureContract(**data)
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"❌ Failed to load contract {contract_file}: {e}")
+            return None
         
-        if feature in visited:
-            return True
+        created_at = contract.created_at
+        if self._index_contract(contract):
+            self._graph_version += 1
+        contract.created_at = created_at
+        
+        # The file already holds this exact payload
+        self._contract_hashes[contract.feature_name] = hashlib.blake2b(payload, digest_size=16).digest()
         
-        visited.add(feature)
-        for dep in dependencies:
-            if dep in self.dependency_graph:
-                if self._has_circular_dependency(dep, self.dependency_graph[dep], visited):
-                    return True
+        logger.info(f"📂 Loaded contract for feature: {contract.feature_name}")
+        return contract
+    
+    def _find_cycles(self) -> Set[str]:
+        """Find every feature whose dependency chain runs into a cycle"""
+        if self._cycle_cache and self._cycle_cache[0] == self._graph_version:
+            return self._cycle_cache[1]
+        
+        # Adjacency is maintained by _index_contract, so a cache miss only reruns the DFS
+        names, edges = self._node_names, self._dep_edges
+        # Node state kept as int bitsets: bit i of on_stack/done/cyclic belongs to node i
+        on_stack = done = cyclic = 0
+        
+        # Single iterative DFS over the whole graph;
+        # each stack frame is (node, position of the next edge to visit)
+        for root in range(len(names)):
+            if (on_stack | done) >> root & 1:
+                continue
+            on_stack |= 1 << root
+            stack = [[root, 0]]
+            
+            while stack:
+                frame = stack[-1]
+                node, edge = frame
+                deps = edges[node]
+                while edge < len(deps):
+                    dep = deps[edge]
+                    edge += 1
+                    bit = 1 << dep
+                    if not (on_stack | done) & bit:
+                        break
+                    if (on_stack | cyclic) & bit:
+                        # Back edge, or an already finished node that reaches a cycle
+                        cyclic |= 1 << node
+                else:
+                    on_stack &= ~(1 << node)
+                    done |= 1 << node
+                    stack.pop()
+                    if stack and cyclic >> node & 1:
+                        cyclic |= 1 << stack[-1][0]
+                    continue
+                
+                frame[1] = edge
+                on_stack |= bit
+                stack.append([dep, 0])
         
-        visited.remove(feature)
-        return False
\ No newline at end of file
+        result = {names[i] for i in range(len(names)) if cyclic >> i & 1}
+        self._cycle_cache = (self._graph_version, result)
+        return result
@@ -3,114 +3,212 @@ CORE COMPONENT: Handler Event Bus
 =================================
 Event-driven communication between handlers
 """
-prakash
+
 import asyncio
 import json
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, Any, List, Callable, Optional
+from collections import Counter, deque
+from datetime import datetime, timezone
+from itertools import count, islice
+from typing import Deque, Dict, Any, List, Callable, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class HandlerEvent:
     """Structured event for handler communication"""
-    event_id: str
+    event_id: int
     event_type: str
     data: Dict[str, Any]
     source_handler: str
-    timestamp: str
+    timestamp: int  # time.time_ns() at publish
     correlation_id: str = None
+    
+    @property
+    def iso_timestamp(self) -> str:
+        """UTC ISO-8601 form of the timestamp, formatted only when read"""
+        seconds, nanos = divmod(self.timestamp, 1_000_000_000)
+        moment = datetime.fromtimestamp(seconds, timezone.utc)
+        return moment.replace(tzinfo=None, microsecond=nanos // 1000).isoformat()
+
+class _Subscription:
+    """One subscriber with its own bounded inbox, drained by a consumer task while events are pending"""
+    __slots__ = ('callback', 'is_coro', 'queue', 'consumer')
+    
+    def __init__(self, callback: Callable, queue_size: int):
+        self.callback = callback
+        self.is_coro = asyncio.iscoroutinefunction(callback)
+        # Oldest pending events are dropped first when a slow subscriber falls this far behind
+        self.queue: Deque[HandlerEvent] = deque(maxlen=queue_size)
+        self.consumer: Optional[asyncio.Task] = None
 
 class HandlerEventBus:
     """Event bus for handler coordination and communication"""
     
     def __init__(self):
-        self.subscribers: Dict[str, List[Callable]] = {}
-        self.event_history: List[HandlerEvent] = []
-        self.active_correlations: Dict[str, List[str]] = {}  # correlation_id -> event_ids
+        # event_type -> subscriptions; publish only enqueues, each subscription's consumer delivers.
+        # Tuples are replaced, never mutated, so publish can iterate a snapshot without copying
+        self.subscribers: Dict[str, Tuple[_Subscription, ...]] = {}
+        self.subscriber_queue_size = 1024
         self.max_history_size = 1000
+        self._event_ids = count(1)
+        # Ring buffer: appending past the cap drops the oldest event in O(1)
+        self.event_history: Deque[HandlerEvent] = deque(maxlen=self.max_history_size)
+        # correlation_id -> events still in history, oldest first
+        self.active_correlations: Dict[str, Deque[HandlerEvent]] = {}
+        
+        # Running per-handler / per-type counts over the events currently in history
+        self._handler_counts: Counter = Counter()
+        self._event_type_counts: Counter = Counter()
     
     def subscribe(self, event_type: str, callback: Callable, handler_name: str = "unknown"):
         """Subscribe to specific event types"""
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        
-        self.subscribers[event_type].append(callback)
-        logger.info(f"📡 Handler '{handler_name}' subscribed to event: {event_type}")
+        subscription = _Subscription(callback, self.subscriber_queue_size)
+        self.subscribers[event_type] = self.subscribers.get(event_type, ()) + (subscription,)
+        logger.info("📡 Handler '%s' subscribed to event: %s", handler_name, event_type)
+    
+    def unsubscribe(self, event_type: str, callback: Callable):
+        """Remove a previously subscribed callback (no-op if it is not subscribed)"""
+        subscribers = self.subscribers.get(event_type)
+        if not subscribers:
+            return
+        for index, subscription in enumerate(subscribers):
+            if subscription.callback == callback:
+                # Undelivered events are dropped; a running consumer exits once its inbox is empty
+                subscription.queue.clear()
+                remaining = subscribers[:index] + subscribers[index + 1:]
+                if remaining:
+                    self.subscribers[event_type] = remaining
+                else:
+                    del self.subscribers[event_type]
+                break
     
     async def publish(self, event_type: str, data: Dict[str, Any], 
                      source_handler: str = "system", correlation_id: str = None):
-        """Publish event to all subscribers"""
+        """Publish event to all subscribers (returns once queued; use flush() to await delivery)"""
         
-        # Create structured event
+        # Create structured event; ids and timestamps stay ints until someone reads them
+        event_id = next(self._event_ids)
         event = HandlerEvent(
-            event_id=str(uuid.uuid4()),
+            event_id=event_id,
             event_type=event_type,
             data=data,
             source_handler=source_handler,
-            timestamp=datetime.utcnow().isoformat(),
-            correlation_id=correlation_id or str(uuid.uuid4())
+            timestamp=time.time_ns(),
+            correlation_id=correlation_id or f"event-{event_id}"
         )
         
-        # Store in history
+        # Store in history, retiring the event the ring buffer is about to drop
+        if len(self.event_history) == self.event_history.maxlen:
+            self._forget(self.event_history[0])
         self.event_history.append(event)
-        if len(self.event_history) > self.max_history_size:
-            self.event_history = self.event_history[-self.max_history_size:]
+        self._handler_counts[source_handler] += 1
+        self._event_type_counts[event_type] += 1
         
         # Track correlations
-        if event.correlation_id not in self.active_correlations:
-            self.active_correlations[event.correlation_id] = []
-        self.active_correlations[event.correlation_id].append(event.event_id)
+        correlated = self.active_correlations.get(event.correlation_id)
+        if correlated is None:
+            correlated = self.active_correlations[event.correlation_id] = deque()
+        correlated.append(event)
         
-        logger.info(f"📢 Publishing event: {event_type} from {source_handler}")
+        logger.info("📢 Publishing event: %s from %s", event_type, source_handler)
         
-        # Notify subscribers asynchronously
-        subscribers = self.subscribers.get(event_type, [])
-        if subscribers:
-            tasks = []
-            for callback in subscribers:
-                task = asyncio.create_task(self._safe_callback(callback, event))
-                tasks.append(task)
-            
-            # Wait for all callbacks to complete
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
-        else:
-            logger.warning(f"⚠️ No subscribers for event: {event_type}")
+        # Hand the event to each subscriber's inbox; slow subscribers never block the publisher
+        subscribers = self.subscribers.get(event_type, ())
+        for subscription in subscribers:
+            if len(subscription.queue) == subscription.queue.maxlen:
+                logger.warning("⚠️ Subscriber inbox full for event: %s, dropping oldest event", event_type)
+            subscription.queue.append(event)
+            if subscription.consumer is None:
+                self._start_consumer(subscription)
+        
+        if not subscribers:
+            logger.warning("⚠️ No subscribers for event: %s", event_type)
+    
+    def _start_consumer(self, subscription: _Subscription):
+        """Start draining a subscription's inbox"""
+        task = asyncio.create_task(self._consume(subscription))
+        # Under an eager task factory the consumer may already have drained the inbox and finished
+        if not task.done():
+            subscription.consumer = task
+    
+    async def _consume(self, subscription: _Subscription):
+        """Deliver a subscription's queued events in order, then exit until more arrive"""
+        current = asyncio.current_task()
+        try:
+            queue = subscription.queue
+            while queue:
+                await self._safe_callback(subscription.callback, subscription.is_coro, queue.popleft())
+        finally:
+            # Only clear our own slot; a finished eager run must not clear a consumer started after it
+            if subscription.consumer is current:
+                subscription.consumer = None
+            # Events left behind (e.g. by a cancelled delivery) get a fresh consumer
+            if subscription.queue and subscription.consumer is None and not current.cancelling():
+                self._start_consumer(subscription)
+    
+    async def flush(self):
+        """Wait until every event published so far has been delivered"""
+        while True:
+            consumers = [
+                subscription.consumer
+                for subscriptions in self.subscribers.values()
+                for subscription in subscriptions
+                if subscription.consumer is not None and not subscription.consumer.done()
+            ]
+            if not consumers:
+                return
+            await asyncio.gather(*consumers, return_exceptions=True)
     
-    async def _safe_callback(self, callback: Callable, event: HandlerEvent):
+    def _forget(self, event: HandlerEvent):
+        """Remove an evicted event from the running statistics and correlation index"""
+        # History evicts oldest-first, so the event heads its correlation's deque
+        correlated = self.active_correlations[event.correlation_id]
+        correlated.popleft()
+        if not correlated:
+            del self.active_correlations[event.correlation_id]
+        
+        for counts, key in ((self._handler_counts, event.source_handler),
+                            (self._event_type_counts, event.event_type)):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+    
+    async def _safe_callback(self, callback: Callable, is_coro: bool, event: HandlerEvent):
         """Execute callback with error handling"""
         try:
-            if asyncio.iscoroutinefunction(callback):
+            if is_coro:
                 await callback(event)
             else:
                 callback(event)
         except Exception as e:
-            logger.error(f"❌ Event callback failed for {event.event_type}: {e}")
+            logger.error("❌ Event callback failed for %s: %s", event.event_type, e)
     
     def get_event_history(self, event_types: List[str] = None, 
                          correlation_id: str = None, 
                          source_handler: str = None) -> List[HandlerEvent]:
         """Get filtered event history"""
-        filtered_events = self.event_history
-        
-        if event_types:
-            filtered_events = [e for e in filtered_events if e.event_type in event_types]
-        
+        # A correlation's index already holds exactly its in-history events, oldest first
         if correlation_id:
-            filtered_events = [e for e in filtered_events if e.correlation_id == correlation_id]
+            events = self.active_correlations.get(correlation_id, ())
+        else:
+            events = self.event_history
         
-        if source_handler:
-            filtered_events = [e for e in filtered_events if e.source_handler == source_handler]
+        wanted_types = set(event_types) if event_types else None
         
-        return filtered_events
+        # Single pass with all remaining predicates fused
+        return [
+            e for e in events
+            if (wanted_types is None or e.event_type in wanted_types)
+            and (not source_handler or e.source_handler == source_handler)
+        ]
     
     def get_correlation_events(self, correlation_id: str) -> List[HandlerEvent]:
         """Get all events for a specific correlation ID"""
-        return [e for e in self.event_history if e.correlation_id == correlation_id]
+        return list(self.active_correlations.get(correlation_id, ()))
     
     def wait_for_event(self, event_type: str, timeout: int = 30) -> asyncio.Future:
         """Wait for specific event with timeout"""
@@ -123,8 +221,14 @@ class HandlerEventBus:
         self.subscribe(event_type, callback, "wait_for_event")
         
         # Set timeout
-        asyncio.create_task(self._timeout_future(future, timeout))
+        timeout_task = asyncio.create_task(self._timeout_future(future, timeout))
+        
+        # Once resolved (event, timeout or caller cancel) drop the timer and the subscription
+        def cleanup(_: asyncio.Future):
+            timeout_task.cancel()
+            self.unsubscribe(event_type, callback)
         
+        future.add_done_callback(cleanup)
         return future
     
     async def _timeout_future(self, future: asyncio.Future, timeout: int):
@@ -139,28 +243,14 @@ class HandlerEventBus:
     
     def get_handler_statistics(self) -> Dict[str, Any]:
         """Get event bus statistics"""
-        handler_counts = {}
-        event_type_counts = {}
-        
-        for event in self.event_history:
-            # Count by handler
-            if event.source_handler not in handler_counts:
-                handler_counts[event.source_handler] = 0
-            handler_counts[event.source_handler] += 1
-            
-            # Count by event type
-            if event.event_type not in event_type_counts:
-                event_type_counts[event.event_type] = 0
-            event_type_counts[event.event_type] += 1
-        
         return {
             "total_events": len(self.event_history),
             "active_correlations": len(self.active_correlations),
             "subscriber_count": sum(len(subs) for subs in self.subscribers.values()),
-            "handler_event_counts": handler_counts,
-            "event_type_counts": event_type_counts,
+            "handler_event_counts": dict(self._handler_counts),
+            "event_type_counts": dict(self._event_type_counts),
             "recent_events": [
-                {"type": e.event_type, "source": e.source_handler, "time": e.timestamp}
-                for e in self.event_history[-5:]
+                {"type": e.event_type, "source": e.source_handler, "time": e.iso_timestamp}
+                for e in islice(self.event_history, max(0, len(self.event_history) - 5), None)
             ]
         }
\ No newline at end of file
@@ -6,12 +6,83 @@ Cross-stack quality validation and coordination between handlers
 
 import asyncio
 import json
-
+import logging
 import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Callable, FrozenSet, List, Tuple
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Every keyword any security validator looks for, matched case-insensitively with
+# plain substring checks - far cheaper in CPython than regex alternation over the file
+_AUTH_TERMS = frozenset(['jwt', 'token', 'auth', 'login'])
+_JWT_TERMS = frozenset(['jwt', 'jsonwebtoken'])
+_SANITIZATION_TERMS = frozenset([
+    'sanitize', 'escape', 'validate', 'joi.', 'validator.',
+    'xss', 'sql.*injection', 'csrf',
+    'helmet', 'cors', 'rate.*limit'
+])
+
+# Phrases that need their words in order on one line, only tried when both words occur
+_SECURITY_PHRASES = {
+    'sql.*injection': (('sql', 'injection'), re.compile(r'sql.*injection')),
+    'rate.*limit': (('rate', 'limit'), re.compile(r'rate.*limit'))
+}
+
+_SECURITY_KEYWORDS = tuple(
+    (_AUTH_TERMS | _JWT_TERMS | _SANITIZATION_TERMS | {'bcrypt', 'sql', 'injection', 'rate', 'limit'})
+    - _SECURITY_PHRASES.keys()
+)
+
+def _keyword_hits(content: str) -> FrozenSet[str]:
+    """Security keywords (and phrases) present in one file"""
+    lowered = content.lower()
+    hits = {keyword for keyword in _SECURITY_KEYWORDS if keyword in lowered}
+    for phrase, (words, pattern) in _SECURITY_PHRASES.items():
+        if hits.issuperset(words) and pattern.search(lowered):
+            hits.add(phrase)
+    return frozenset(hits)
+
+@dataclass(slots=True)
+class HandlerFeatures:
+    """Security features found in one handler's generated files, extracted in a single pass"""
+    keyword_hits: FrozenSet[str]  # union of keyword hits over all files
+    has_auth: bool
+    has_jwt: bool
+    has_bcrypt: bool
+    has_rate_limit: bool  # "rate" and "limit" in the same file
+    has_sanitization: bool
+
+def _extract_handler_features(code_files: Dict[str, str]) -> HandlerFeatures:
+    """Walk a handler's files once and derive every flag the security validators need"""
+    keyword_hits = set()
+    has_rate_limit = False
+    for content in code_files.values():
+        hits = _keyword_hits(content)
+        keyword_hits |= hits
+        if 'rate' in hits and 'limit' in hits:
+            has_rate_limit = True
+    
+    return HandlerFeatures(
+        keyword_hits=frozenset(keyword_hits),
+        has_auth=not keyword_hits.isdisjoint(_AUTH_TERMS),
+        has_jwt=not keyword_hits.isdisjoint(_JWT_TERMS),
+        has_bcrypt='bcrypt' in keyword_hits,
+        has_rate_limit=has_rate_limit,
+        has_sanitization=not keyword_hits.isdisjoint(_SANITIZATION_TERMS)
+    )
+
+def _extract_features(handler_results: Dict[str, Any]) -> Dict[str, HandlerFeatures]:
+    """Features for every handler that produced code files"""
+    return {
+        handler_name: _extract_handler_features(result.code_files)
+        for handler_name, result in handler_results.items()
+        if hasattr(result, 'code_files')
+    }
+
+@dataclass(slots=True)
 class QualityReport:
     """Comprehensive quality assessment report"""
     overall_score: float
@@ -24,7 +95,7 @@ class QualityReport:
     validation_timestamp: str
     refinement_cycles: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class CrossStackIssue:
     """Cross-stack consistency issue"""
     issue_type: str  # "contract_mismatch", "security_gap", "performance_issue"
@@ -42,6 +113,11 @@ class QualityCoordinator:
         self.quality_threshold = 8.0
         self.max_refinement_cycles = 5
         
+        # (handler_name, contract_key) -> (entries list, registry version, derived names); reused across
+        # validation passes while the handler hands back the same list and no contract was registered.
+        # Handlers build these lists once per result and never edit them, improvements return new ones
+        self._contract_sets: Dict[Tuple[str, str], Tuple[List, int, FrozenSet[str]]] = {}
+        
         # Quality validation rules
         self.validation_rules = {
             "contract_consistency": {
@@ -91,30 +167,39 @@ class QualityCoordinator:
                                 target_quality: float = 8.0) -> QualityReport:
         """Main quality validation and refinement orchestrator"""
         
-        logger.info(f"🔍 Starting cross-stack quality validation (target: {target_quality}/10)")
+        logger.info("🔍 Starting cross-stack quality validation (target: %s/10)", target_quality)
         
         # Initial quality assessment
         initial_report = await self._assess_cross_stack_quality(handler_results)
         
         if initial_report.overall_score >= target_quality:
-            logger.info(f"✅ Quality target achieved: {initial_report.overall_score}/10")
+            logger.info("✅ Quality target achieved: %s/10", initial_report.overall_score)
             return initial_report
         
         # Refinement cycles
-        current_results = handler_results.copy()
+        # Improvements hand back a new dict when they change anything, so no defensive copy is needed
+        current_results = handler_results
         current_report = initial_report
         
         for cycle in range(1, self.max_refinement_cycles + 1):
-            logger.info(f"🔄 Quality refinement cycle {cycle}: {current_report.overall_score}/10")
+            logger.info("🔄 Quality refinement cycle %s: %s/10", cycle, current_report.overall_score)
             
             # Identify priority issues to fix
             priority_issues = self._prioritize_issues(current_report)
+            if not priority_issues:
+                logger.info("🔄 Stopping refinement: no critical issues left to fix")
+                break
             
             # Apply coordinated improvements
             improved_results = await self._apply_coordinated_improvements(
                 current_results, priority_issues, cycle
             )
             
+            # Same object back means nothing changed, so re-assessing would give the same report
+            if improved_results is current_results:
+                logger.info("🔄 Stopping refinement: no improvements could be applied")
+                break
+            
             # Re-assess quality
             current_report = await self._assess_cross_stack_quality(improved_results)
             current_report.refinement_cycles = cycle
@@ -131,12 +216,12 @@ class QualityCoordinator:
             
             # Check if target achieved
             if current_report.overall_score >= target_quality:
-                logger.info(f"✅ Quality target achieved after {cycle} cycles: {current_report.overall_score}/10")
+                logger.info("✅ Quality target achieved after %s cycles: %s/10", cycle, current_report.overall_score)
                 break
         
         # Final quality report
         if current_report.overall_score < target_quality:
-            logger.warning(f"⚠️ Quality target not fully achieved: {current_report.overall_score}/10 (target: {target_quality}/10)")
+            logger.warning("⚠️ Quality target not fully achieved: %s/10 (target: %s/10)", current_report.overall_score, target_quality)
             current_report.recommendations.append(
                 f"Consider human review - automated refinement reached {current_report.overall_score}/10"
             )
@@ -146,7 +231,7 @@ class QualityCoordinator:
     async def _assess_cross_stack_quality(self, handler_results: Dict[str, Any]) -> QualityReport:
         """Comprehensive cross-stack quality assessment"""
         
-        validation_start = datetime.utcnow()
+        validation_start = time.perf_counter()
         
         # Initialize report
         report = QualityReport(
@@ -157,7 +242,7 @@ class QualityCoordinator:
             warnings=[],
             recommendations=[],
             metrics={},
-            validation_timestamp=validation_start.isoformat()
+            validation_timestamp=datetime.utcnow().isoformat()
         )
         
         # Collect individual handler scores
@@ -169,29 +254,43 @@ class QualityCoordinator:
         
         average_handler_score = total_handler_score / len(handler_results) if handler_results else 0
         
-        # Run cross-stack validations
+        # One pass over all generated code (off the event loop) feeds every validator
+        features = await asyncio.to_thread(_extract_features, handler_results)
+        
+        # Run cross-stack validations: every validator of every rule at once, they are independent
+        outcomes = await asyncio.gather(
+            *(validator(handler_results, features)
+              for rule_config in self.validation_rules.values()
+              for validator in rule_config["validators"]),
+            return_exceptions=True
+        )
+        
         cross_stack_issues = []
         total_cross_stack_score = 0.0
+        offset = 0
         
         for rule_name, rule_config in self.validation_rules.items():
             rule_score = 0.0
             rule_issues = []
             
-            # Run all validators for this rule
-            for validator in rule_config["validators"]:
-                try:
-                    validator_result = await validator(handler_results)
-                    rule_score += validator_result["score"]
-                    rule_issues.extend(validator_result["issues"])
-                except Exception as e:
-                    logger.error(f"❌ Validator {validator.__name__} failed: {e}")
+            # Outcomes come back in plan order, so this rule's results are the next len(validators)
+            validators = rule_config["validators"]
+            rule_outcomes = outcomes[offset:offset + len(validators)]
+            offset += len(validators)
+            
+            for validator, validator_result in zip(validators, rule_outcomes):
+                if isinstance(validator_result, Exception):
+                    logger.error("❌ Validator %s failed: %s", validator.__name__, validator_result)
                     rule_issues.append(CrossStackIssue(
                         issue_type="validation_error",
                         severity="warning",
-                        description=f"Validator {validator.__name__} failed: {str(e)}",
+                        description=f"Validator {validator.__name__} failed: {str(validator_result)}",
                         affected_handlers=list(handler_results.keys()),
                         suggested_fix="Review validator implementation"
                     ))
+                else:
+                    rule_score += validator_result["score"]
+                    rule_issues.extend(validator_result["issues"])
             
             # Average score for this rule
             avg_rule_score = rule_score / len(rule_config["validators"])
@@ -215,7 +314,7 @@ class QualityCoordinator:
         
         # Compile metrics
         report.metrics = {
-            "validation_duration": (datetime.utcnow() - validation_start).total_seconds(),
+            "validation_duration": time.perf_counter() - validation_start,
             "handlers_validated": len(handler_results),
             "cross_stack_rules_checked": len(self.validation_rules),
             "total_issues_found": len(cross_stack_issues),
@@ -226,12 +325,26 @@ class QualityCoordinator:
             "cross_stack_weighted_score": report.cross_stack_score
         }
         
-        logger.info(f"📊 Quality assessment completed: {report.overall_score}/10 ({len(report.critical_issues)} critical issues)")
+        logger.info("📊 Quality assessment completed: %s/10 (%s critical issues)", report.overall_score, len(report.critical_issues))
         
         return report
     
+    def _contract_names(self, handler_name: str, result: Any, contract_key: str,
+                        name_of: Callable[[Dict[str, Any]], str]) -> FrozenSet[str]:
+        """Names derived from one contract list, rebuilt when the list or the registry changes"""
+        entries = result.contracts.get(contract_key, [])
+        version = self.contracts.version
+        cache_key = (handler_name, contract_key)
+        cached = self._contract_sets.get(cache_key)
+        if cached is not None and cached[0] is entries and cached[1] == version:
+            return cached[2]
+        
+        names = frozenset(name_of(entry) for entry in entries)
+        self._contract_sets[cache_key] = (entries, version, names)
+        return names
+    
     # Contract Consistency Validators
-    async def _validate_api_consistency(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_api_consistency(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         """Validate API consistency between frontend and backend"""
         score = 10.0
         issues = []
@@ -242,17 +355,17 @@ class QualityCoordinator:
         if not backend_result or not frontend_result:
             return {"score": score, "issues": issues}
         
-        # Get backend API endpoints
-        backend_apis = backend_result.contracts.get("api_endpoints", [])
-        frontend_apis = frontend_result.contracts.get("api_calls", [])
-        
         # Check if frontend calls match backend endpoints
-        backend_endpoints = set(f"{api['method']} {api['path']}" for api in backend_apis)
-        frontend_calls = set(api.get("endpoint", "") for api in frontend_apis)
+        backend_endpoints = self._contract_names(
+            "backend", backend_result, "api_endpoints", lambda api: f"{api['method']} {api['path']}"
+        )
+        frontend_calls = self._contract_names(
+            "frontend", frontend_result, "api_calls", lambda api: api.get("endpoint", "")
+        )
         
         # Find mismatches
-        missing_backend = frontend_calls - backend_endpoints
-        unused_backend = backend_endpoints - frontend_calls
+        missing_backend = frontend_calls.difference(backend_endpoints)
+        unused_backend = backend_endpoints.difference(frontend_calls)
         
         if missing_backend:
             score -= 3.0
@@ -276,7 +389,7 @@ class QualityCoordinator:
         
         return {"score": max(0, score), "issues": issues}
     
-    async def _validate_data_model_consistency(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_data_model_consistency(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         """Validate data models consistency between backend and database"""
         score = 10.0
         issues = []
@@ -288,12 +401,16 @@ class QualityCoordinator:
             return {"score": score, "issues": issues}
         
         # Get models from both handlers
-        backend_models = set(model.get("name", "") for model in backend_result.contracts.get("models_created", []))
-        database_models = set(model.get("name", "") for model in database_result.contracts.get("tables_created", []))
+        backend_models = self._contract_names(
+            "backend", backend_result, "models_created", lambda model: model.get("name", "")
+        )
+        database_models = self._contract_names(
+            "database", database_result, "tables_created", lambda model: model.get("name", "")
+        )
         
         # Check consistency
-        missing_database = backend_models - database_models
-        missing_backend = database_models - backend_models
+        missing_database = backend_models.difference(database_models)
+        missing_backend = database_models.difference(backend_models)
         
         if missing_database:
             score -= 2.0
@@ -317,29 +434,16 @@ class QualityCoordinator:
         
         return {"score": max(0, score), "issues": issues}
     
-    async def _validate_authentication_consistency(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_authentication_consistency(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         """Validate authentication patterns across all handlers"""
         score = 10.0
         issues = []
         
         # Check if all handlers implement consistent authentication
-        auth_patterns = {}
-        
-        for handler_name, result in handler_results.items():
-            if hasattr(result, 'code_files'):
-                auth_found = False
-                jwt_found = False
-                
-                for file_path, content in result.code_files.items():
-                    if any(auth_term in content.lower() for auth_term in ['jwt', 'token', 'auth', 'login']):
-                        auth_found = True
-                    if 'jwt' in content.lower() or 'jsonwebtoken' in content.lower():
-                        jwt_found = True
-                
-                auth_patterns[handler_name] = {
-                    "has_auth": auth_found,
-                    "uses_jwt": jwt_found
-                }
+        auth_patterns = {
+            handler_name: {"has_auth": handler.has_auth, "uses_jwt": handler.has_jwt}
+            for handler_name, handler in features.items()
+        }
         
         # Validate consistency
         auth_handlers = [h for h, p in auth_patterns.items() if p["has_auth"]]
@@ -359,58 +463,32 @@ class QualityCoordinator:
         return {"score": max(0, score), "issues": issues}
     
     # Security Validators
-    async def _validate_input_sanitization(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_input_sanitization(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         """Validate input sanitization across handlers"""
         score = 10.0
         issues = []
         
-        security_patterns = [
-            r'sanitize|escape|validate|joi\.|validator\.',
-            r'xss|sql.*injection|csrf',
-            r'helmet|cors|rate.*limit'
-        ]
-        
-        for handler_name, result in handler_results.items():
-            if hasattr(result, 'code_files'):
-                has_sanitization = False
-                
-                for file_path, content in result.code_files.items():
-                    if any(re.search(pattern, content, re.IGNORECASE) for pattern in security_patterns):
-                        has_sanitization = True
-                        break
-                
-                if not has_sanitization and handler_name in ['backend', 'frontend']:
-                    score -= 3.0
-                    issues.append(CrossStackIssue(
-                        issue_type="security_gap",
-                        severity="critical",
-                        description=f"No input sanitization patterns found in {handler_name}",
-                        affected_handlers=[handler_name],
-                        suggested_fix="Add input validation and sanitization"
-                    ))
+        for handler_name, handler in features.items():
+            if not handler.has_sanitization and handler_name in ['backend', 'frontend']:
+                score -= 3.0
+                issues.append(CrossStackIssue(
+                    issue_type="security_gap",
+                    severity="critical",
+                    description=f"No input sanitization patterns found in {handler_name}",
+                    affected_handlers=[handler_name],
+                    suggested_fix="Add input validation and sanitization"
+                ))
         
         return {"score": max(0, score), "issues": issues}
     
-    async def _validate_authentication_security(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_authentication_security(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         """Validate authentication security implementation"""
         score = 10.0
         issues = []
         
-        backend_result = handler_results.get("backend")
-        if backend_result and hasattr(backend_result, 'code_files'):
-            has_bcrypt = False
-            has_jwt = False
-            has_rate_limit = False
-            
-            for content in backend_result.code_files.values():
-                if 'bcrypt' in content.lower():
-                    has_bcrypt = True
-                if 'jwt' in content.lower() or 'jsonwebtoken' in content.lower():
-                    has_jwt = True
-                if 'rate' in content.lower() and 'limit' in content.lower():
-                    has_rate_limit = True
-            
-            if not has_bcrypt:
+        backend = features.get("backend")
+        if handler_results.get("backend") and backend is not None:
+            if not backend.has_bcrypt:
                 score -= 2.0
                 issues.append(CrossStackIssue(
                     issue_type="security_gap",
@@ -420,7 +498,7 @@ class QualityCoordinator:
                     suggested_fix="Implement bcrypt for password hashing"
                 ))
             
-            if not has_jwt:
+            if not backend.has_jwt:
                 score -= 2.0
                 issues.append(CrossStackIssue(
                     issue_type="security_gap",
@@ -430,7 +508,7 @@ class QualityCoordinator:
                     suggested_fix="Implement JWT for authentication"
                 ))
             
-            if not has_rate_limit:
+            if not backend.has_rate_limit:
                 score -= 1.0
                 issues.append(CrossStackIssue(
                     issue_type="security_gap",
@@ -443,37 +521,37 @@ class QualityCoordinator:
         return {"score": max(0, score), "issues": issues}
     
     # Placeholder validators (implement as needed)
-    async def _validate_authorization_patterns(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_authorization_patterns(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_data_encryption(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_data_encryption(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_database_efficiency(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_database_efficiency(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_api_response_patterns(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_api_response_patterns(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_caching_strategies(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_caching_strategies(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_error_handling(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_error_handling(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_logging_patterns(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_logging_patterns(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_code_structure(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_code_structure(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_documentation(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_documentation(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_naming_conventions(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_naming_conventions(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
-    async def _validate_testing_readiness(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def _validate_testing_readiness(self, handler_results: Dict[str, Any], features: Dict[str, HandlerFeatures]) -> Dict[str, Any]:
         return {"score": 8.0, "issues": []}
     
     def _prioritize_issues(self, quality_report: QualityReport) -> List[CrossStackIssue]:
@@ -487,9 +565,9 @@ class QualityCoordinator:
                                            cycle: int) -> Dict[str, Any]:
         """Apply coordinated improvements across handlers"""
         
-        # For now, return original results
-        # This would be enhanced to actually apply improvements
-        logger.info(f"🔧 Applying {len(priority_issues)} coordinated improvements (cycle {cycle})")
+        # For now, return original results (the same object, which tells the caller nothing changed)
+        # This would be enhanced to actually apply improvements, returning a new dict when it does
+        logger.info("🔧 Applying %s coordinated improvements (cycle %s)", len(priority_issues), cycle)
         
         # Placeholder for improvement logic
         return handler_results
@@ -497,9 +575,10 @@ class QualityCoordinator:
     async def validate_contracts_only(self, handler_results: Dict[str, Any]) -> Dict[str, Any]:
         """Quick contract validation without full quality assessment"""
         
-        contract_issues = await self._validate_api_consistency(handler_results)
-        model_issues = await self._validate_data_model_consistency(handler_results)
-        auth_issues = await self._validate_authentication_consistency(handler_results)
+        features = await asyncio.to_thread(_extract_features, handler_results)
+        contract_issues = await self._validate_api_consistency(handler_results, features)
+        model_issues = await self._validate_data_model_consistency(handler_results, features)
+        auth_issues = await self._validate_authentication_consistency(handler_results, features)
         
         return {
             "contract_score": (contract_issues["score"] + model_issues["score"] + auth_issues["score"]) / 3,
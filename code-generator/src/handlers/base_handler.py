@@ -5,17 +5,144 @@ Base class for all technology-specific handlers with context preservation
 """
 
 import asyncio
-import json
+import bisect
 import hashlib
+import heapq
+import inspect
+import os
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
+from itertools import accumulate
+from typing import Callable, ClassVar, Deque, Dict, Any, Hashable, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+import orjson
+
+try:
+    import tiktoken
+except ImportError:  # Optional: token counts fall back to a chars/4 estimate
+    tiktoken = None
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Token counts keyed by a content digest, so the cache never pins large context strings
+_TOKEN_COUNT_CACHE_SIZE = 4096
+_token_counts: "OrderedDict[bytes, int]" = OrderedDict()
+_token_counts_lock = threading.Lock()
+
+# Fixed (chunk_id, chunk_type, priority) of each context chunk; only content and timestamp vary per call
+_ARCHITECTURE_CHUNK = ("architecture", "architecture", 1)   # Critical architecture decisions
+_CONTRACTS_CHUNK = ("contracts", "contracts", 1)            # Existing contracts
+_HISTORY_CHUNK = ("history", "previous_code", 2)            # Previous generation history
+_FEATURES_CHUNK = ("features", "feature_spec", 1)           # Feature specifications
+
+_TOKEN_LIMIT_MARKER = "\n... [TRUNCATED FOR TOKEN LIMIT]"
+
+# Wide contracts only list the endpoints most related to the feature being generated
+_ENDPOINT_PROJECTION_THRESHOLD = 30
+_ENDPOINT_PROJECTION_TOP_K = 20
+
+# Upper bound on the optional history chunk, in UTF-8 bytes (a token spans at least one byte):
+# fixed header/footer, plus per entry its labels and quality score, plus each listed item's repr
+_HISTORY_FRAME_BYTES = 64
+_HISTORY_ENTRY_BYTES = 96
+_HISTORY_ADMISSION_RATIO = 0.8
+
+_JSON_BLOCK_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+def _dumps(value: Any) -> str:
+    """Indented JSON for prompt blocks (orjson: faster, and non-ASCII stays unescaped)"""
+    return orjson.dumps(value, option=_JSON_BLOCK_OPTIONS).decode()
+
+# Fixed prompt scaffolding, filled with format_map per call
+_ARCHITECTURE_CONTEXT_TEMPLATE = """
+=== ARCHITECTURE CONTEXT ===
+Project: {project}
+Tech Stack: {stack}
+Design Patterns: {patterns}
+Security Standards: {security}
+Naming Conventions: {naming}
+=== END ARCHITECTURE ===
+"""
+
+_FEATURE_CONTEXT_TEMPLATE = """
+=== FEATURES TO IMPLEMENT ===
+Features: {features}
+Requirements: {requirements}
+Dependencies: {dependencies}
+=== END FEATURES ===
+"""
+
+# Rendered architecture/contracts blocks kept per handler, reused across generations and refinements
+_CONTEXT_CACHE_SIZE = 64
+
+# Process-wide pool so handlers rendering identical blocks share one string. Bounded with strong
+# references: str can't be weakly referenced, and sys.intern'd strings are immortal on 3.12
+_CONTEXT_POOL_SIZE = 128
+_context_pool: "OrderedDict[bytes, str]" = OrderedDict()
+_context_pool_lock = threading.Lock()
+
+def _intern_context(text: str) -> str:
+    """Return the pooled string equal to text, pooling text itself if it is new"""
+    key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    with _context_pool_lock:
+        pooled = _context_pool.get(key)
+        if pooled is not None:
+            _context_pool.move_to_end(key)
+            return pooled
+        _context_pool[key] = text
+        if len(_context_pool) > _CONTEXT_POOL_SIZE:
+            _context_pool.popitem(last=False)
+    return text
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """cl100k_base tokenizer, or None when tiktoken or its BPE data is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"⚠️ tiktoken encoding unavailable, estimating tokens from length: {e}")
+        return None
+
+def _count_tokens(text: str) -> int:
+    """Count tokens in text, once per distinct content"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4  # Rough estimate
+    
+    key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    with _token_counts_lock:
+        count = _token_counts.get(key)
+        if count is not None:
+            _token_counts.move_to_end(key)
+            return count
+    
+    count = len(encoding.encode(text, disallowed_special=()))
+    with _token_counts_lock:
+        _token_counts[key] = count
+        if len(_token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return count
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, int]:
+    """Cut text down to at most max_tokens tokens, returning the kept text and its token count"""
+    encoding = _get_encoding()
+    if encoding is None:
+        kept = text[:max(max_tokens, 0) * 4]
+        return kept, len(kept) // 4
+    tokens = encoding.encode(text, disallowed_special=())[:max(max_tokens, 0)]
+    # A token prefix can end inside a multi-byte character; drop the partial bytes instead of emitting U+FFFD
+    return encoding.decode_bytes(tokens).decode("utf-8", errors="ignore"), len(tokens)
+
+@dataclass(slots=True)
 class HandlerResult:
     """Result from handler code generation"""
     success: bool
@@ -29,7 +156,7 @@ class HandlerResult:
     error_message: str = None
     refinement_cycles: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class ContextChunk:
     """Context chunk for Claude token management"""
     chunk_id: str
@@ -42,6 +169,15 @@ class ContextChunk:
 class TechnologyHandler(ABC):
     """Base class for all technology handlers"""
     
+    # Hard cap on a single context chunk, applied before tokenizing
+    MAX_CHUNK_BYTES = 512_000
+    
+    # Shared by every handler instance so concurrent generations can't stampede the Claude API;
+    # one semaphore per event loop, since a semaphore binds to the loop that first waits on it
+    _claude_semaphores: ClassVar["weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"] = (
+        weakref.WeakKeyDictionary()
+    )
+    
     def __init__(self, contract_registry, event_bus, claude_client=None):
         self.contracts = contract_registry
         self.events = event_bus
@@ -51,11 +187,19 @@ class TechnologyHandler(ABC):
         self.handler_type = "base"
         self.quality_threshold = 8.0
         self.max_refinement_cycles = 5
+        self.plateau_epsilon = 0.05        # Stop refining once a cycle gains less than this
+        self.close_enough_epsilon = 0.1    # Don't spend a Claude call to close a gap smaller than this
         self.max_tokens_per_request = 150000  # Conservative limit
         
         # Context management for Claude
-        self.context_chunks: List[ContextChunk] = []
-        self.generation_history: List[Dict[str, Any]] = []
+        self.context_chunks: Deque[ContextChunk] = deque(maxlen=32)
+        # Only the last 3 generations are ever used for context, so older ones are dropped on append
+        self.generation_history: Deque[Dict[str, Any]] = deque(maxlen=3)
+        self._context_cache: Dict[Hashable, str] = {}
+        self._context_cache_lock = threading.Lock()
+        
+        # correlation_id -> events held back during refinement, published together on finalize
+        self._pending_events: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
         
         # Subscribe to relevant events
         self._setup_event_subscriptions()
@@ -70,7 +214,7 @@ class TechnologyHandler(ABC):
                           quality_target: float = 8.0) -> HandlerResult:
         """Main code generation method with context preservation"""
         
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         correlation_id = self.events.create_correlation_id()
         
         try:
@@ -95,7 +239,7 @@ class TechnologyHandler(ABC):
             # Step 4: Register contracts and publish events
             await self._finalize_generation(refined_result, correlation_id)
             
-            generation_time = (datetime.utcnow() - start_time).total_seconds()
+            generation_time = time.perf_counter() - start_time
             refined_result.generation_time = generation_time
             
             logger.info(f"✅ {self.handler_type} generation completed: {refined_result.quality_score}/10 quality")
@@ -104,6 +248,9 @@ class TechnologyHandler(ABC):
         except Exception as e:
             logger.error(f"❌ {self.handler_type} generation failed: {e}")
             
+            # Refinement cycles that did complete are still reported, ahead of the failure
+            await self._publish_pending_events(correlation_id)
+            
             # Publish failure event
             await self.events.publish("handler_generation_failed", {
                 "handler": self.handler_type,
@@ -125,55 +272,77 @@ class TechnologyHandler(ABC):
                                     context: Dict[str, Any]) -> List[ContextChunk]:
         """Prepare context chunks for Claude with token management"""
         
-        chunks = []
+        created_at = datetime.utcnow().isoformat()
         
-        # Chunk 1: Critical architecture decisions (Priority 1)
-        architecture_context = self._build_architecture_context(context)
-        chunks.append(ContextChunk(
-            chunk_id="architecture",
-            chunk_type="architecture",
-            content=architecture_context,
-            priority=1,
-            tokens_estimate=len(architecture_context) // 4,  # Rough estimate
-            created_at=datetime.utcnow().isoformat()
+        # Critical builders are independent: run them (and their token counting) concurrently off the event loop
+        chunks = list(await asyncio.gather(
+            asyncio.to_thread(self._build_chunk, _ARCHITECTURE_CHUNK, created_at,
+                              self._build_architecture_context, context),
+            asyncio.to_thread(self._build_chunk, _CONTRACTS_CHUNK, created_at,
+                              self._build_contracts_context, features),
+            asyncio.to_thread(self._build_chunk, _FEATURES_CHUNK, created_at,
+                              self._build_feature_context, features, context)
         ))
         
-        # Chunk 2: Existing contracts (Priority 1)
-        contracts_context = self._build_contracts_context(features)
-        chunks.append(ContextChunk(
-            chunk_id="contracts",
-            chunk_type="contracts", 
-            content=contracts_context,
-            priority=1,
-            tokens_estimate=len(contracts_context) // 4,
-            created_at=datetime.utcnow().isoformat()
-        ))
-        
-        # Chunk 3: Previous generation history (Priority 2)
-        if self.generation_history:
-            history_context = self._build_history_context()
-            chunks.append(ContextChunk(
-                chunk_id="history",
-                chunk_type="previous_code",
-                content=history_context,
-                priority=2,
-                tokens_estimate=len(history_context) // 4,
-                created_at=datetime.utcnow().isoformat()
-            ))
-        
-        # Chunk 4: Feature specifications (Priority 1)
-        feature_context = self._build_feature_context(features, context)
-        chunks.append(ContextChunk(
-            chunk_id="features",
-            chunk_type="feature_spec",
-            content=feature_context,
-            priority=1,
-            tokens_estimate=len(feature_context) // 4,
-            created_at=datetime.utcnow().isoformat()
-        ))
+        # History is nice-to-have: skip building it when it could push the critical chunks past the budget
+        if self.generation_history and self._admit_history_chunk(chunks):
+            chunks.insert(2, await asyncio.to_thread(self._build_chunk, _HISTORY_CHUNK, created_at,
+                                                     self._build_history_context))
         
         return self._optimize_chunks_for_tokens(chunks)
     
+    def _history_upper_bound(self) -> int:
+        """Upper bound on the history chunk's tokens, from its raw fields without rendering it"""
+        size = _HISTORY_FRAME_BYTES
+        for gen in self.generation_history:
+            size += _HISTORY_ENTRY_BYTES + sum(
+                len(repr(item).encode()) + 2  # list separator
+                for key in ('features', 'patterns_used') for item in gen.get(key, ())
+            )
+        return min(size, self.MAX_CHUNK_BYTES)
+    
+    def _admit_history_chunk(self, critical_chunks: List[ContextChunk]) -> bool:
+        """Whether the history chunk fits in the budget the critical chunks leave"""
+        used = sum(chunk.tokens_estimate for chunk in critical_chunks)
+        upper_bound = used + self._history_upper_bound()
+        if upper_bound > _HISTORY_ADMISSION_RATIO * self.max_tokens_per_request:
+            logger.warning(f"⚠️ {self.handler_type} context near token budget (~{upper_bound} tokens), skipping history chunk")
+            return False
+        return True
+    
+    @classmethod
+    def _claude_semaphore(cls) -> asyncio.Semaphore:
+        """The Claude concurrency limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = cls._claude_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(int(os.environ.get("CLAUDE_MAX_CONCURRENCY", "5")))
+            cls._claude_semaphores[loop] = semaphore
+        return semaphore
+    
+    async def _guarded_claude_call(self, call: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a Claude client call under the shared concurrency limit, off the event loop if it is blocking"""
+        async with self._claude_semaphore():
+            if inspect.iscoroutinefunction(call):
+                return await call(*args, **kwargs)
+            return await asyncio.to_thread(call, *args, **kwargs)
+    
+    def _build_chunk(self, template: Tuple[str, str, int], created_at: str,
+                     build: Callable[..., str], *args) -> ContextChunk:
+        """Build one chunk's content and count its tokens (runs in a worker thread)"""
+        chunk_id, chunk_type, priority = template
+        content = self._cap_chunk_content(build(*args))
+        return ContextChunk(chunk_id, chunk_type, content, priority, _count_tokens(content), created_at)
+    
+    def _cap_chunk_content(self, content: str) -> str:
+        """Cut content to MAX_CHUNK_BYTES of UTF-8 without splitting a character"""
+        if len(content) <= self.MAX_CHUNK_BYTES // 4:  # Can't exceed the cap even at 4 bytes per char
+            return content
+        encoded = content.encode()
+        if len(encoded) <= self.MAX_CHUNK_BYTES:
+            return content
+        return str(memoryview(encoded)[:self.MAX_CHUNK_BYTES], 'utf-8', 'ignore') + "\n... [TRUNCATED FOR SIZE LIMIT]"
+    
     def _optimize_chunks_for_tokens(self, chunks: List[ContextChunk]) -> List[ContextChunk]:
         """Optimize chunks to fit within token limits"""
         
@@ -185,20 +354,30 @@ class TechnologyHandler(ABC):
         if total_tokens <= self.max_tokens_per_request:
             return chunks
         
-        # Remove lowest priority chunks until we fit
-        optimized_chunks = []
-        current_tokens = 0
+        # The longest priority-ordered prefix that fits is kept verbatim (one bisect on running totals)
+        cumulative_tokens = list(accumulate(chunk.tokens_estimate for chunk in chunks))
+        fit = bisect.bisect_right(cumulative_tokens, self.max_tokens_per_request)
+        optimized_chunks = chunks[:fit]
+        current_tokens = cumulative_tokens[fit - 1] if fit else 0
         
-        for chunk in chunks:
-            if current_tokens + chunk.tokens_estimate <= self.max_tokens_per_request:
+        # Past it, lower priority chunks are dropped unless they still fit
+        for chunk in chunks[fit:]:
+            if chunk.priority == 1:  # Always include critical chunks, truncated to the remaining budget
+                # The marker's tokens come out of the budget too, so the truncated chunk still fits;
+                # with no room left past the marker, nothing more is added
+                marker_tokens = _count_tokens(_TOKEN_LIMIT_MARKER)
+                remaining_tokens = self.max_tokens_per_request - current_tokens - marker_tokens
+                if remaining_tokens <= 0:
+                    break
+                truncated_content, kept_tokens = _truncate_to_tokens(chunk.content, remaining_tokens)
+                chunk.content = truncated_content + _TOKEN_LIMIT_MARKER
+                chunk.tokens_estimate = kept_tokens + marker_tokens
                 optimized_chunks.append(chunk)
                 current_tokens += chunk.tokens_estimate
-            elif chunk.priority == 1:  # Always include critical chunks, truncate if needed
-                truncated_content = chunk.content[:int((self.max_tokens_per_request - current_tokens) * 4)]
-                chunk.content = truncated_content + "\n... [TRUNCATED FOR TOKEN LIMIT]"
-                chunk.tokens_estimate = len(chunk.content) // 4
-                optimized_chunks.append(chunk)
                 break
+            if current_tokens + chunk.tokens_estimate <= self.max_tokens_per_request:
+                optimized_chunks.append(chunk)
+                current_tokens += chunk.tokens_estimate
         
         logger.info(f"🔧 Optimized context: {len(optimized_chunks)} chunks, ~{current_tokens} tokens")
         return optimized_chunks
@@ -207,12 +386,7 @@ class TechnologyHandler(ABC):
     async def _generate_with_chunked_context(self, features: List[str], 
                                            context_chunks: List[ContextChunk],
                                            correlation_id: str) -> HandlerResult:
-        """Generate code using chunked context - implemented by subclasses"""
-        pass
-    
-    @abstractmethod
-    def _build_expert_prompt(self, features: List[str], context_chunks: List[ContextChunk]) -> str:
-        """Build technology-specific expert prompt - implemented by subclasses"""
+        """Generate code using chunked context - implemented by subclasses (call Claude via _guarded_claude_call)"""
         pass
     
     @abstractmethod
@@ -220,34 +394,85 @@ class TechnologyHandler(ABC):
         """Validate generated code quality - implemented by subclasses"""
         pass
     
+    def _memoized_context(self, key: Hashable, build: Callable[[], str]) -> str:
+        """Return the cached context block for key, building it on a miss"""
+        with self._context_cache_lock:
+            content = self._context_cache.get(key)
+        if content is not None:
+            return content
+        
+        content = _intern_context(build())
+        with self._context_cache_lock:
+            if len(self._context_cache) >= _CONTEXT_CACHE_SIZE:
+                del self._context_cache[next(iter(self._context_cache))]
+            self._context_cache[key] = content
+        return content
+    
     def _build_architecture_context(self, context: Dict[str, Any]) -> str:
         """Build architecture context string"""
-        return f"""
-=== ARCHITECTURE CONTEXT ===
-Project: {context.get('project_name', 'Unknown')}
-Tech Stack: {json.dumps(context.get('technology_stack', {}), indent=2)}
-Design Patterns: {context.get('established_patterns', [])}
-Security Standards: {context.get('security_standards', [])}
-Naming Conventions: {json.dumps(context.get('naming_conventions', {}), indent=2)}
-=== END ARCHITECTURE ===
-"""
+        # Keyed on every input the block renders, serialized the same way the block is
+        inputs = orjson.dumps(
+            [repr(context.get('project_name', 'Unknown')),
+             context.get('technology_stack', {}),
+             repr(context.get('established_patterns', [])),
+             repr(context.get('security_standards', [])),
+             context.get('naming_conventions', {})],
+            default=repr,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+        key = hashlib.blake2b(inputs, digest_size=16).digest()
+        return self._memoized_context(key, lambda: self._render_architecture_context(context))
+    
+    def _render_architecture_context(self, context: Dict[str, Any]) -> str:
+        """Render architecture context string"""
+        return _ARCHITECTURE_CONTEXT_TEMPLATE.format_map({
+            "project": context.get('project_name', 'Unknown'),
+            "stack": _dumps(context.get('technology_stack', {})),
+            "patterns": context.get('established_patterns', []),
+            "security": context.get('security_standards', []),
+            "naming": _dumps(context.get('naming_conventions', {}))
+        })
     
     def _build_contracts_context(self, features: List[str]) -> str:
         """Build contracts context string"""
+        # Any contract registration bumps the registry version, which retires stale entries
+        key = ("contracts", self.contracts.version, tuple(features))
+        return self._memoized_context(key, lambda: self._render_contracts_context(features))
+    
+    def _render_contracts_context(self, features: List[str]) -> str:
+        """Render contracts context string"""
+        contracts = self.contracts.get_feature_contracts(features)
         context_parts = ["=== EXISTING CONTRACTS ==="]
         
-        for feature in features:
-            contract = self.contracts.get_feature_contract(feature)
+        for feature, contract in contracts.items():
             if contract:
-                context_parts.append(f"\nFeature: {feature}")
-                context_parts.append(f"Endpoints: {len(contract.endpoints)}")
-                for ep in contract.endpoints:
-                    context_parts.append(f"  {ep.method} {ep.path}")
+                endpoints = contract.endpoints
+                context_parts.append(f"\nFeature: {feature}\nEndpoints: {len(endpoints)}")
+                listed = self._project_endpoints(endpoints, feature)
+                context_parts.extend([f"  {ep.method} {ep.path}" for ep in listed])
+                if len(listed) < len(endpoints):
+                    context_parts.append(f"  ... {len(endpoints) - len(listed)} less related endpoints omitted")
                 context_parts.append(f"Models: {[m.name for m in contract.models]}")
         
         context_parts.append("=== END CONTRACTS ===")
         return "\n".join(context_parts)
     
+    def _project_endpoints(self, endpoints: List[Any], feature: str,
+                           k: int = _ENDPOINT_PROJECTION_TOP_K) -> List[Any]:
+        """Endpoints worth showing for a feature: all of a narrow contract, else the k whose paths share most words with it"""
+        if len(endpoints) <= _ENDPOINT_PROJECTION_THRESHOLD:
+            return endpoints
+        
+        feature_words = [word for word in feature.lower().split('_') if word]
+        
+        def relevance(index: int) -> int:
+            path = endpoints[index].path.lower()
+            return sum(word in path for word in feature_words)
+        
+        # Keep the contract's own endpoint order among the selected ones
+        selected = heapq.nlargest(k, range(len(endpoints)), key=relevance)
+        return [endpoints[index] for index in sorted(selected)]
+    
     def _build_history_context(self) -> str:
         """Build generation history context"""
         if not self.generation_history:
@@ -255,10 +480,8 @@ Naming Conventions: {json.dumps(context.get('naming_conventions', {}), indent=2)
         
         context_parts = ["=== GENERATION HISTORY ==="]
         
-        # Include last 3 generations to avoid token overflow
-        recent_history = self.generation_history[-3:]
-        
-        for i, gen in enumerate(recent_history):
+        # History keeps only the last 3 generations to avoid token overflow
+        for i, gen in enumerate(self.generation_history):
             context_parts.append(f"\nGeneration {i+1}:")
             context_parts.append(f"Features: {gen.get('features', [])}")
             context_parts.append(f"Quality: {gen.get('quality_score', 0)}/10")
@@ -269,13 +492,11 @@ Naming Conventions: {json.dumps(context.get('naming_conventions', {}), indent=2)
     
     def _build_feature_context(self, features: List[str], context: Dict[str, Any]) -> str:
         """Build feature-specific context"""
-        return f"""
-=== FEATURES TO IMPLEMENT ===
-Features: {features}
-Requirements: {context.get('requirements', {})}
-Dependencies: {context.get('feature_dependencies', {})}
-=== END FEATURES ===
-"""
+        return _FEATURE_CONTEXT_TEMPLATE.format_map({
+            "features": features,
+            "requirements": context.get('requirements', {}),
+            "dependencies": context.get('feature_dependencies', {})
+        })
     
     async def _refine_until_quality_met(self, initial_result: HandlerResult, 
                                       quality_target: float, 
@@ -288,6 +509,10 @@ Dependencies: {context.get('feature_dependencies', {})}
         while (current_result.quality_score < quality_target and 
                cycle < self.max_refinement_cycles):
             
+            if quality_target - current_result.quality_score < self.close_enough_epsilon:
+                logger.info(f"🎯 {self.handler_type} within {self.close_enough_epsilon} of target, skipping further refinement")
+                break
+            
             cycle += 1
             logger.info(f"🔄 {self.handler_type} refinement cycle {cycle}: {current_result.quality_score}/10")
             
@@ -298,16 +523,21 @@ Dependencies: {context.get('feature_dependencies', {})}
             improved_result = await self._apply_improvements(current_result, improvement_prompt)
             
             # Update result
+            improvement = improved_result.quality_score - current_result.quality_score
             current_result = improved_result
             current_result.refinement_cycles = cycle
             
-            # Publish refinement event
-            await self.events.publish("refinement_cycle_completed", {
+            # Queue refinement event; the whole chain is published once the generation finalizes
+            self._pending_events.setdefault(correlation_id, []).append(("refinement_cycle_completed", {
                 "handler": self.handler_type,
                 "cycle": cycle,
                 "quality_score": current_result.quality_score,
                 "target": quality_target
-            }, self.handler_type, correlation_id)
+            }))
+            
+            if improvement < self.plateau_epsilon:
+                logger.info(f"📉 {self.handler_type} refinement plateaued ({improvement:+.2f}), stopping")
+                break
         
         if current_result.quality_score < quality_target:
             logger.warning(f"⚠️ {self.handler_type} quality target not met after {cycle} cycles")
@@ -317,16 +547,25 @@ Dependencies: {context.get('feature_dependencies', {})}
     async def _finalize_generation(self, result: HandlerResult, correlation_id: str):
         """Finalize generation with contract registration and events"""
         
-        # Store generation in history for future context
+        # Store generation in history for future context; only a digest and summary of the contracts
+        contracts_digest = hashlib.blake2b(
+            orjson.dumps(result.contracts, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=repr),
+            digest_size=16
+        ).hexdigest()
         self.generation_history.append({
             "timestamp": datetime.utcnow().isoformat(),
             "features": result.features_implemented,
             "quality_score": result.quality_score,
             "patterns_used": self._extract_patterns_used(result),
-            "contracts": result.contracts
+            "contracts_digest": contracts_digest,
+            "contracts_summary": {
+                key: len(value) for key, value in result.contracts.items()
+                if isinstance(value, (list, dict))
+            }
         })
         
-        # Publish completion event
+        # Publish queued refinement events, then completion event
+        await self._publish_pending_events(correlation_id)
         await self.events.publish(f"{self.handler_type}_generation_completed", {
             "handler": self.handler_type,
             "features": result.features_implemented,
@@ -335,6 +574,11 @@ Dependencies: {context.get('feature_dependencies', {})}
             "files_generated": len(result.code_files)
         }, self.handler_type, correlation_id)
     
+    async def _publish_pending_events(self, correlation_id: str):
+        """Publish, in order, the events queued for this generation"""
+        for event_type, data in self._pending_events.pop(correlation_id, ()):
+            await self.events.publish(event_type, data, self.handler_type, correlation_id)
+    
     def _extract_patterns_used(self, result: HandlerResult) -> List[str]:
         """Extract architectural patterns used in generation"""
         # To be implemented by subclasses based on code analysis
@@ -362,5 +606,5 @@ Dependencies: {context.get('feature_dependencies', {})}
     @abstractmethod
     async def _apply_improvements(self, current_result: HandlerResult, 
                                 improvement_prompt: str) -> HandlerResult:
-        """Apply improvements to code"""
+        """Apply improvements to code (call Claude via _guarded_claude_call)"""
         pass
\ No newline at end of file
@@ -4,128 +4,25 @@ NODE.JS BACKEND HANDLER - DYNAMIC SQL/ENV GENERATION
 Expert-level Node.js backend code generation with intelligent file generation
 """
 
-import json
 import re
 import asyncio
+import random
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 
+import orjson
+
 from src.handlers.base_handler import TechnologyHandler, HandlerResult, ContextChunk
 from src.core.contract_registry import APIEndpoint, DataModel, FeatureContract
 import logging
 
 logger = logging.getLogger(__name__)
 
-class NodeHandler(TechnologyHandler):
-    """Expert Node.js backend code generator"""
-    
-    def __init__(self, contract_registry, event_bus, claude_client=None):
-        super().__init__(contract_registry, event_bus, claude_client)
-        self.handler_type = "node_backend"
-        
-        # Node.js-specific patterns
-        self.node_patterns = {
-            "authentication": {
-                "routes": ["POST /api/auth/login", "POST /api/auth/register", "POST /api/auth/refresh"],
-                "middleware": ["authMiddleware", "validateToken", "rateLimiter"],
-                "services": ["AuthService", "TokenService", "PasswordService"]
-            },
-            "user_management": {
-                "routes": ["GET /api/users", "POST /api/users", "PUT /api/users/:id", "DELETE /api/users/:id"],
-                "middleware": ["validateUser", "checkPermissions"],
-                "services": ["UserService", "ValidationService"]
-            },
-            "real_time_chat": {
-                "routes": ["GET /api/chat/rooms", "POST /api/chat/rooms", "GET /api/chat/messages"],
-                "middleware": ["socketAuth", "roomValidator"],
-                "services": ["ChatService", "SocketService", "MessageService"]
-            }
-        }
-        
-        # Quality validation patterns
-        self.quality_patterns = {
-            "error_handling": r"try\s*{|catch\s*\(|\.catch\(|next\(|throw\s+new",
-            "validation": r"joi\.|validator\.|validate\(|schema\.",
-            "security": r"helmet|cors|sanitize|escape|bcrypt|jwt",
-            "logging": r"logger\.|console\.|winston|log\(",
-            "async_await": r"async\s+function|await\s+",
-            "middleware": r"\.use\(|middleware|next\(\)",
-            "database": r"\.findOne|\.create|\.update|\.delete|\.save|query\(",
-            "status_codes": r"\.status\(|res\.json|res\.send"
-        }
-    
-    async def _generate_with_chunked_context(self, features: List[str], 
-                                           context_chunks: List[ContextChunk],
-                                           correlation_id: str) -> HandlerResult:
-        """Generate Node.js code using chunked context"""
-        
-        if not self.claude_client:
-            raise Exception("Claude client not initialized")
-        
-        # Build expert Node.js prompt
-        prompt = self._build_expert_prompt(features, context_chunks)
-        
-        try:
-            # Make Claude API call
-            response = await self._claude_request_with_retry(prompt, max_tokens=8000)
-            response_text = response.content[0].text
-            
-            # Parse response into structured code
-            parsed_code = self._parse_node_response(response_text)
-            
-            # Validate code quality
-            quality_report = await self._validate_code_quality(parsed_code)
-            
-            # Extract and register contracts
-            contracts = self._extract_node_contracts(parsed_code, features)
-            
-            # Register API endpoints in contract registry
-            await self._register_api_contracts(features, contracts)
-            
-            return HandlerResult(
-                success=True,
-                handler_type=self.handler_type,
-                features_implemented=features,
-                code_files=parsed_code,
-                contracts=contracts,
-                quality_score=quality_report["overall_score"],
-                tokens_used=response.usage.input_tokens + response.usage.output_tokens if hasattr(response, 'usage') else 0
-            )
-            
-        except Exception as e:
-            logger.error(f"❌ Node.js generation failed: {e}")
-            raise e
-    
-    def _build_expert_prompt(self, features: List[str], context_chunks: List[ContextChunk]) -> str:
-        """Build expert-level Node.js prompt with context"""
-        
-        # Combine context chunks
-        context_content = "\n\n".join([
-            f"=== {chunk.chunk_type.upper()} ===\n{chunk.content}"
-            for chunk in context_chunks
-        ])
-        
-        features_text = "\n".join([f"- {feature.replace('_', ' ').title()}" for feature in features])
-        
-        # Get expected API patterns for features
-        expected_apis = []
-        for feature in features:
-            if feature in self.node_patterns:
-                expected_apis.extend(self.node_patterns[feature]["routes"])
-        
-        expected_apis_text = "\n".join([f"- {api}" for api in expected_apis])
-        
-        prompt = f"""You are an EXPERT Node.js backend developer with 10+ years of enterprise experience. Generate PRODUCTION-READY backend code with PERFECT architecture and 9/10 quality.
-
-{context_content}
-
-FEATURES TO IMPLEMENT:
-{features_text}
+# Static parts of the generation prompt; only the context, features and expected APIs between them vary
+_EXPERT_PROMPT_HEADER = """You are an EXPERT Node.js backend developer with 10+ years of enterprise experience. Generate PRODUCTION-READY backend code with PERFECT architecture and 9/10 quality."""
 
-EXPECTED API ENDPOINTS:
-{expected_apis_text}
-
-NODE.JS REQUIREMENTS:
+_EXPERT_PROMPT_TAIL = """NODE.JS REQUIREMENTS:
 1. **Express.js Framework**: Latest version with proper structure
 2. **Authentication**: JWT tokens with refresh, bcrypt passwords
 3. **Validation**: Joi schemas for all inputs
@@ -170,21 +67,21 @@ INTELLIGENT FILE GENERATION REQUIREMENTS:
 
 CRITICAL JSON RESPONSE REQUIREMENTS:
 - Your response MUST be ONLY valid JSON. No explanations, no markdown, no code blocks.
-- Start with {{ and end with }}. Nothing else.
+- Start with { and end with }. Nothing else.
 - Do NOT use ```json or ``` anywhere in your response.
 - Each file path maps to complete working code as a string.
 - Use \\n for line breaks in code strings.
 - AUTOMATICALLY generate ALL files needed for a complete working application
 
 RESPONSE FORMAT - ONLY THIS JSON STRUCTURE:
-{{"src/controllers/authController.js": "complete_working_controller_code", "src/models/User.js": "complete_sequelize_model", "database/migrations/001_create_users.sql": "CREATE_TABLE_statement_matching_your_User_model", "package.json": "complete_package_json_with_ALL_dependencies_your_code_uses", ".env.example": "ALL_environment_variables_your_code_references", "src/config/database.js": "database_config_if_your_code_needs_it"}}
+{"src/controllers/authController.js": "complete_working_controller_code", "src/models/User.js": "complete_sequelize_model", "database/migrations/001_create_users.sql": "CREATE_TABLE_statement_matching_your_User_model", "package.json": "complete_package_json_with_ALL_dependencies_your_code_uses", ".env.example": "ALL_environment_variables_your_code_references", "src/config/database.js": "database_config_if_your_code_needs_it"}
 
 EXAMPLE CORRECT RESPONSE:
-{{"file1.js": "const bcrypt = require('bcryptjs'); module.exports = {{ hash: bcrypt.hash }};", "package.json": "{{ \\"dependencies\\": {{ \\"bcryptjs\\": \\"^2.4.3\\" }} }}", ".env.example": "# Bcrypt configuration\\nBCRYPT_ROUNDS=12"}}
+{"file1.js": "const bcrypt = require('bcryptjs'); module.exports = { hash: bcrypt.hash };", "package.json": "{ \\"dependencies\\": { \\"bcryptjs\\": \\"^2.4.3\\" } }", ".env.example": "# Bcrypt configuration\\nBCRYPT_ROUNDS=12"}
 
 EXAMPLE WRONG RESPONSE (DO NOT DO THIS):
 ```json
-{{"file": "code"}}
+{"file": "code"}
 ```
 
 CRITICAL REQUIREMENTS:
@@ -204,7 +101,152 @@ CRITICAL REQUIREMENTS:
 
 Generate ONLY the JSON object. No other text. Implement ALL features with complete functionality and ALL supporting files based on what you actually create."""
 
-        return prompt
+# Improvement prompts only carry files with issues, compactly serialized and capped at this many characters
+_IMPROVEMENT_FILES_CHAR_LIMIT = 60_000
+
+# Node.js-specific patterns, shared read-only by every handler instance
+_NODE_PATTERNS = MappingProxyType({feature: MappingProxyType(spec) for feature, spec in {
+    "authentication": {
+        "routes": ("POST /api/auth/login", "POST /api/auth/register", "POST /api/auth/refresh"),
+        "middleware": ("authMiddleware", "validateToken", "rateLimiter"),
+        "services": ("AuthService", "TokenService", "PasswordService")
+    },
+    "user_management": {
+        "routes": ("GET /api/users", "POST /api/users", "PUT /api/users/:id", "DELETE /api/users/:id"),
+        "middleware": ("validateUser", "checkPermissions"),
+        "services": ("UserService", "ValidationService")
+    },
+    "real_time_chat": {
+        "routes": ("GET /api/chat/rooms", "POST /api/chat/rooms", "GET /api/chat/messages"),
+        "middleware": ("socketAuth", "roomValidator"),
+        "services": ("ChatService", "SocketService", "MessageService")
+    }
+}.items()})
+
+# feature -> expected routes, flattened once for prompt building
+_FEATURE_ROUTES = MappingProxyType({feature: spec["routes"] for feature, spec in _NODE_PATTERNS.items()})
+
+# Quality validation patterns
+_QUALITY_PATTERNS = MappingProxyType({
+    "error_handling": r"try\s*{|catch\s*\(|\.catch\(|next\(|throw\s+new",
+    "validation": r"joi\.|validator\.|validate\(|schema\.",
+    "security": r"helmet|cors|sanitize|escape|bcrypt|jwt",
+    "logging": r"logger\.|console\.|winston|log\(",
+    "async_await": r"async\s+function|await\s+",
+    "middleware": r"\.use\(|middleware|next\(\)",
+    "database": r"\.findOne|\.create|\.update|\.delete|\.save|query\(",
+    "status_codes": r"\.status\(|res\.json|res\.send"
+})
+_QUALITY_RES = {name: re.compile(pattern) for name, pattern in _QUALITY_PATTERNS.items()}
+# All categories in one alternation, so a file is usually scanned once; each category owns one bit
+_QUALITY_BITS = {name: 1 << i for i, name in enumerate(_QUALITY_PATTERNS)}
+_COMBINED_QUALITY_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _QUALITY_PATTERNS.items())
+)
+
+# Contract and fallback extractors
+_ROUTE_RE = re.compile(r'(?:router|app)\s*\.\s*(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]', re.IGNORECASE)
+_MODEL_RE = re.compile(r'(?:sequelize\.define|DataTypes)\s*\(\s*[\'"`](\w+)[\'"`]', re.IGNORECASE)
+_SERVICE_RE = re.compile(r'class\s+(\w+Service)|(?:const|let|var)\s+(\w+Service)')
+# A line holding only a file path, optionally commented, quoted or emphasized
+_FILE_HEADER_RE = re.compile(r'^\s*(?://|#+)?\s*[*"\'`]*([\w./@-]+\.(?:js|json|ts|sql))[*"\'`]*:?\s*$')
+
+# Path roles that decide which quality checks apply; the lookahead reports overlapping roles too.
+# app.js/server.js stay case-sensitive, matching the original substring checks
+_ROLE_RE = re.compile(r'(?=(controller|route|auth|security|config|(?-i:app\.js|server\.js)))', re.IGNORECASE)
+
+# Files with these suffixes are not validated at all; only JS/TS sources get the pattern checks
+_SKIP_VALIDATION_SUFFIXES = ('.sql', '.env', '.env.example', '.md', '.txt', '.yml', '.yaml')
+_JS_SUFFIXES = ('.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx')
+
+# Validating this many files or more moves the regex work off the event loop
+_THREADED_VALIDATION_MIN_FILES = 4
+
+# Upper bound, in seconds, on the backoff between Claude retries (before jitter)
+_MAX_RETRY_WAIT = 30
+
+# Sent as the system prompt of generation calls; the breakpoint lets Claude reuse the cached prefix
+_EXPERT_SYSTEM_BLOCKS = [
+    {"type": "text", "text": _EXPERT_PROMPT_HEADER},
+    {"type": "text", "text": _EXPERT_PROMPT_TAIL, "cache_control": {"type": "ephemeral"}}
+]
+
+class NodeHandler(TechnologyHandler):
+    """Expert Node.js backend code generator"""
+    
+    def __init__(self, contract_registry, event_bus, claude_client=None):
+        super().__init__(contract_registry, event_bus, claude_client)
+        self.handler_type = "node_backend"
+        
+        # Shared, read-only pattern tables
+        self.node_patterns = _NODE_PATTERNS
+        self.quality_patterns = _QUALITY_PATTERNS
+    
+    async def _generate_with_chunked_context(self, features: List[str], 
+                                           context_chunks: List[ContextChunk],
+                                           correlation_id: str) -> HandlerResult:
+        """Generate Node.js code using chunked context"""
+        
+        if not self.claude_client:
+            raise Exception("Claude client not initialized")
+        
+        # Static instructions go in the cached system prompt, only the request itself varies
+        request = self._build_generation_request(features, context_chunks)
+        
+        try:
+            # Make Claude API call
+            response = await self._claude_request_with_retry(request, max_tokens=8000, system=_EXPERT_SYSTEM_BLOCKS)
+            response_text = response.content[0].text
+            
+            # Parse response into structured code
+            parsed_code = self._parse_node_response(response_text)
+            
+            # Validate code quality
+            quality_report = await self._validate_code_quality(parsed_code)
+            
+            # Extract and register contracts; issues ride along for the improvement prompt
+            contracts = self._extract_node_contracts(parsed_code, features)
+            contracts["quality_issues"] = quality_report["issues"]
+            contracts["file_scores"] = {path: report["score"] for path, report in quality_report["file_scores"].items()}
+            
+            # Register API endpoints in contract registry
+            await self._register_api_contracts(features, contracts)
+            
+            return HandlerResult(
+                success=True,
+                handler_type=self.handler_type,
+                features_implemented=features,
+                code_files=parsed_code,
+                contracts=contracts,
+                quality_score=quality_report["overall_score"],
+                tokens_used=response.usage.input_tokens + response.usage.output_tokens if hasattr(response, 'usage') else 0
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Node.js generation failed: {e}")
+            raise e
+    
+    def _build_generation_request(self, features: List[str], context_chunks: List[ContextChunk]) -> str:
+        """Build the per-call part of the generation prompt: context, features and expected APIs"""
+        
+        # Combine context chunks
+        context_content = "\n\n".join([
+            f"=== {chunk.chunk_type.upper()} ===\n{chunk.content}"
+            for chunk in context_chunks
+        ])
+        
+        # One pass over features collects both the feature lines and their expected API routes
+        feature_lines = []
+        api_lines = []
+        feature_routes = _FEATURE_ROUTES
+        for feature in features:
+            feature_lines.append(f"- {feature.replace('_', ' ').title()}")
+            api_lines.extend(f"- {api}" for api in feature_routes.get(feature, ()))
+        
+        features_text = "\n".join(feature_lines)
+        expected_apis_text = "\n".join(api_lines)
+        
+        return f"{context_content}\n\nFEATURES TO IMPLEMENT:\n{features_text}\n\nEXPECTED API ENDPOINTS:\n{expected_apis_text}"
     
     def _parse_node_response(self, response: str) -> Dict[str, str]:
         """Parse Claude's Node.js response into structured code files"""
@@ -219,7 +261,7 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
             
             if start_idx != -1 and end_idx > start_idx:
                 json_content = response_clean[start_idx:end_idx]
-                parsed = json.loads(json_content)
+                parsed = orjson.loads(json_content)
                 
                 # Validate structure
                 if isinstance(parsed, dict) and all(
@@ -231,7 +273,7 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
             # Fallback: Extract code blocks
             return self._extract_code_blocks_fallback(response)
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning(f"JSON parsing failed: {e}, using fallback extraction")
             return self._extract_code_blocks_fallback(response)
     
@@ -240,23 +282,40 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
         
         code_files = {}
         
-        # Pattern to match file paths and code blocks
-        file_pattern = r'(?:```(?:javascript|js|json|sql)?\s*)?(?://\s*)?([^\n]*\.(?:js|json|ts|sql))\s*\n(.*?)(?=\n\s*(?://|```|\w+/)|$)'
-        
-        matches = re.findall(file_pattern, response, re.DOTALL)
+        def emit(file_path: Optional[str], lines: List[str]):
+            code_content = "\n".join(lines).strip()
+            if file_path and len(code_content) > 50:
+                code_files[file_path] = code_content
         
-        for file_path, code_content in matches:
-            file_path = file_path.strip().strip('"\'')
-            code_content = code_content.strip()
+        # Single linear pass: a path header starts a file, ``` toggles a fenced block. Once a file's
+        # code is fenced, only fenced lines belong to it; unfenced files run until the next header
+        current_path = None
+        lines = []
+        in_block = False
+        fenced = False
+        block_has_code = False  # A header is only recognized before the first code line of a block
+        for line in response.splitlines():
+            if line.lstrip().startswith("```"):
+                in_block = not in_block
+                block_has_code = False
+                if in_block and not fenced:
+                    fenced = True
+                    lines = []
+                continue
             
-            # Clean up code content
-            if code_content.startswith('```'):
-                code_content = '\n'.join(code_content.split('\n')[1:])
-            if code_content.endswith('```'):
-                code_content = '\n'.join(code_content.split('\n')[:-1])
+            header = _FILE_HEADER_RE.match(line)
+            if header and not block_has_code:
+                emit(current_path, lines)
+                current_path = header.group(1)
+                lines = []
+                fenced = in_block
+                continue
             
-            if file_path and code_content and len(code_content) > 50:
-                code_files[file_path] = code_content
+            if in_block or not fenced:
+                lines.append(line)
+                block_has_code = block_has_code or (in_block and bool(line.strip()))
+        
+        emit(current_path, lines)
         
         # If no files found, create basic structure
         if not code_files:
@@ -276,8 +335,16 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
         file_scores = {}
         issues = []
         
-        for file_path, content in code_files.items():
-            file_score = self._validate_single_file_quality(file_path, content)
+        files = list(code_files.items())
+        if len(files) < _THREADED_VALIDATION_MIN_FILES:
+            reports = [self._validate_single_file_quality(path, content) for path, content in files]
+        else:
+            # re holds the GIL while matching, so one worker for the whole batch frees the loop without per-file thread overhead
+            reports = await asyncio.to_thread(
+                lambda: [self._validate_single_file_quality(path, content) for path, content in files]
+            )
+        
+        for (file_path, _), file_score in zip(files, reports):
             file_scores[file_path] = file_score
             total_score += file_score["score"]
             issues.extend(file_score["issues"])
@@ -302,46 +369,52 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
         score = 10.0
         issues = []
         
-        # Skip validation for SQL and config files
-        if file_path.endswith('.sql') or file_path.endswith('.env.example'):
+        # Skip validation for SQL, docs and config files
+        path_lower = file_path.lower()
+        if path_lower.endswith(_SKIP_VALIDATION_SUFFIXES):
             return {"score": 10.0, "issues": [], "file_path": file_path}
         
+        # The JS pattern checks only apply to JS/TS sources; other files get the structural checks
+        bits = _QUALITY_BITS
+        required = self._required_quality_categories(file_path) if path_lower.endswith(_JS_SUFFIXES) else 0
+        seen = self._scan_quality_categories(content, required) if required else 0
+        
         # Check for error handling
-        if not re.search(self.quality_patterns["error_handling"], content):
+        if required & bits["error_handling"] and not seen & bits["error_handling"]:
             score -= 2.0
             issues.append(f"CRITICAL: No error handling in {file_path}")
         
         # Check for validation (controllers/routes)
-        if 'controller' in file_path.lower() or 'route' in file_path.lower():
-            if not re.search(self.quality_patterns["validation"], content):
+        if required & bits["validation"]:
+            if not seen & bits["validation"]:
                 score -= 1.5
                 issues.append(f"CRITICAL: No input validation in {file_path}")
         
-        # Check for security patterns
-        if 'auth' in file_path.lower() or 'security' in file_path.lower():
-            if not re.search(self.quality_patterns["security"], content):
+        # Check for security patterns (auth/security)
+        if required & bits["security"]:
+            if not seen & bits["security"]:
                 score -= 1.5
                 issues.append(f"CRITICAL: Missing security patterns in {file_path}")
         
-        # Check for proper async/await
-        if not re.search(self.quality_patterns["async_await"], content) and 'config' not in file_path.lower():
+        # Check for proper async/await (everything but config)
+        if required & bits["async_await"] and not seen & bits["async_await"]:
             score -= 1.0
             issues.append(f"Missing async/await patterns in {file_path}")
         
         # Check for logging
-        if not re.search(self.quality_patterns["logging"], content):
+        if required & bits["logging"] and not seen & bits["logging"]:
             score -= 0.5
             issues.append(f"Missing logging in {file_path}")
         
-        # Check for proper HTTP status codes
-        if 'controller' in file_path.lower():
-            if not re.search(self.quality_patterns["status_codes"], content):
+        # Check for proper HTTP status codes (controllers)
+        if required & bits["status_codes"]:
+            if not seen & bits["status_codes"]:
                 score -= 1.0
                 issues.append(f"Missing proper HTTP responses in {file_path}")
         
-        # Check for middleware usage
-        if 'app.js' in file_path or 'server.js' in file_path:
-            if not re.search(self.quality_patterns["middleware"], content):
+        # Check for middleware usage (app.js/server.js)
+        if required & bits["middleware"]:
+            if not seen & bits["middleware"]:
                 score -= 1.0
                 issues.append(f"Missing middleware setup in {file_path}")
         
@@ -361,6 +434,38 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
             "file_path": file_path
         }
     
+    def _required_quality_categories(self, file_path: str) -> int:
+        """Bitmask of the quality categories checked for a file with this path"""
+        bits = _QUALITY_BITS
+        roles = {match.group(1).lower() for match in _ROLE_RE.finditer(file_path)}
+        required = bits["error_handling"] | bits["logging"]
+        if 'controller' in roles or 'route' in roles:
+            required |= bits["validation"]
+        if 'auth' in roles or 'security' in roles:
+            required |= bits["security"]
+        if 'config' not in roles:
+            required |= bits["async_await"]
+        if 'controller' in roles:
+            required |= bits["status_codes"]
+        if 'app.js' in roles or 'server.js' in roles:
+            required |= bits["middleware"]
+        return required
+    
+    def _scan_quality_categories(self, content: str, required: int) -> int:
+        """Bitmask of quality categories present in content, stopping once every required one is seen"""
+        bits = _QUALITY_BITS
+        seen = 0
+        for match in _COMBINED_QUALITY_RE.finditer(content):
+            seen |= bits[match.lastgroup]
+            if seen & required == required:
+                return seen
+        
+        # Alternatives that overlap (e.g. "next(" and "next()") can hide each other in the fused scan
+        for name, bit in bits.items():
+            if required & bit and not seen & bit and _QUALITY_RES[name].search(content):
+                seen |= bit
+        return seen
+    
     def _extract_node_contracts(self, code_files: Dict[str, str], features: List[str]) -> Dict[str, Any]:
         """Extract API contracts from Node.js code"""
         
@@ -372,11 +477,18 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
         }
         
         for file_path, content in code_files.items():
+            # Classify the file by role once; each extractor only runs on files of its role
+            path_lower = file_path.lower()
+            
             # Extract API endpoints from routes/controllers
-            if 'route' in file_path.lower() or 'controller' in file_path.lower():
-                # Pattern for Express routes
-                route_pattern = r'(?:router|app)\s*\.\s*(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]'
-                route_matches = re.findall(route_pattern, content, re.IGNORECASE)
+            if 'route' in path_lower or 'controller' in path_lower:
+                # Express routes
+                route_matches = _ROUTE_RE.findall(content)
+                
+                if route_matches:
+                    content_lower = content.lower()
+                    authentication_required = "auth" in content_lower
+                    validation = "validate" in content_lower or "joi" in content_lower
                 
                 for method, path in route_matches:
                     contracts["api_endpoints"].append({
@@ -384,15 +496,14 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
                         "path": path,
                         "file": file_path,
                         "features": features,
-                        "authentication_required": "auth" in content.lower(),
-                        "validation": "validate" in content.lower() or "joi" in content.lower()
+                        "authentication_required": authentication_required,
+                        "validation": validation
                     })
             
             # Extract models
-            if 'model' in file_path.lower():
-                # Pattern for Sequelize models
-                model_pattern = r'(?:sequelize\.define|DataTypes)\s*\(\s*[\'"`](\w+)[\'"`]'
-                model_matches = re.findall(model_pattern, content, re.IGNORECASE)
+            if 'model' in path_lower:
+                # Sequelize models
+                model_matches = _MODEL_RE.findall(content)
                 
                 for model_name in model_matches:
                     contracts["models_created"].append({
@@ -402,9 +513,8 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
                     })
             
             # Extract services
-            if 'service' in file_path.lower():
-                service_pattern = r'class\s+(\w+Service)|(?:const|let|var)\s+(\w+Service)'
-                service_matches = re.findall(service_pattern, content)
+            if 'service' in path_lower:
+                service_matches = _SERVICE_RE.findall(content)
                 
                 for class_name, const_name in service_matches:
                     service_name = class_name or const_name
@@ -462,9 +572,38 @@ Generate ONLY the JSON object. No other text. Implement ALL features with comple
                                       quality_target: float) -> str:
         """Build improvement prompt for Node.js code refinement"""
         
-        issues_text = "\n".join([
-            f"- {issue}" for issue in current_result.contracts.get("quality_issues", [])
-        ])
+        quality_issues = current_result.contracts.get("quality_issues", [])
+        issues_text = "\n".join([f"- {issue}" for issue in quality_issues])
+        
+        # Only files scoring below target are resent; the rest stay as they are when improvements merge
+        code_files = current_result.code_files
+        file_scores = current_result.contracts.get("file_scores")
+        if file_scores:
+            files_to_fix = {path: code for path, code in code_files.items() if file_scores.get(path, 0) < quality_target}
+        else:
+            # Every issue message ends with the offending file's path
+            flagged_paths = {issue.rsplit(" ", 1)[-1] for issue in quality_issues}
+            files_to_fix = {path: code for path, code in code_files.items() if path in flagged_paths}
+        files_to_fix = files_to_fix or code_files
+        
+        # Cap at whole-file granularity so the resent code stays valid JSON
+        files_sent: Dict[str, str] = {}
+        files_omitted: List[str] = []
+        budget = _IMPROVEMENT_FILES_CHAR_LIMIT
+        for path, code in files_to_fix.items():
+            size = len(orjson.dumps({path: code}))
+            if size > budget:
+                files_omitted.append(path)
+                continue
+            files_sent[path] = code
+            budget -= size
+        files_text = orjson.dumps(files_sent).decode()
+        if files_omitted:
+            omitted_text = "\n".join(f"- {path}" for path in files_omitted)
+            files_text += f"""
+
+OMITTED FILES (not shown to save space; do NOT return or rewrite these):
+{omitted_text}"""
         
         return f"""IMPROVE this Node.js backend code to achieve {quality_target}/10 quality.
 
@@ -474,8 +613,8 @@ TARGET QUALITY: {quality_target}/10
 IDENTIFIED ISSUES:
 {issues_text}
 
-CURRENT CODE FILES:
-{json.dumps(current_result.code_files, indent=2)}
+CURRENT CODE FILES BELOW TARGET:
+{files_text}
 
 IMPROVEMENT REQUIREMENTS:
 1. Add comprehensive error handling with try/catch blocks
@@ -525,6 +664,8 @@ Make every improvement necessary to reach enterprise-grade quality."""
             
             # Update contracts
             contracts = self._extract_node_contracts(final_code, current_result.features_implemented)
+            contracts["quality_issues"] = quality_report["issues"]
+            contracts["file_scores"] = {path: report["score"] for path, report in quality_report["file_scores"].items()}
             
             # Update result
             improved_result = HandlerResult(
@@ -547,31 +688,38 @@ Make every improvement necessary to reach enterprise-grade quality."""
             logger.error(f"❌ Node.js improvement failed: {e}")
             return current_result
     
-    async def _claude_request_with_retry(self, prompt: str, max_tokens: int = 4000, max_retries: int = 3):
+    async def _claude_request_with_retry(self, prompt: str, max_tokens: int = 4000, max_retries: int = 3,
+                                         system: Optional[List[Dict[str, Any]]] = None):
         """Make Claude API request with retry logic"""
         
+        extra = {"system": system} if system else {}
+        
         for attempt in range(max_retries):
             try:
-                await asyncio.sleep(2 * attempt)
-                
-                message = self.claude_client.messages.create(
+                message = await self._guarded_claude_call(
+                    self.claude_client.messages.create,
                     model="claude-3-5-sonnet-20241022",
                     max_tokens=max_tokens,
                     temperature=0.1,
-                    messages=[{"role": "user", "content": prompt}]
+                    messages=[{"role": "user", "content": prompt}],
+                    **extra
                 )
                 
                 return message
                 
             except Exception as e:
+                # Jittered exponential backoff, waited once per failure and never after the last attempt
                 if "overloaded" in str(e) or "rate_limit" in str(e):
-                    wait_time = 5 * (2 ** attempt)
-                    logger.warning(f"⚠️ API overloaded, waiting {wait_time}s (attempt {attempt+1})")
-                    await asyncio.sleep(wait_time)
+                    wait_time = min(_MAX_RETRY_WAIT, 5 * (2 ** attempt)) + random.random()
+                    logger.warning(f"⚠️ API overloaded, waiting {wait_time:.1f}s (attempt {attempt+1})")
                 else:
                     logger.error(f"❌ Claude API error: {e}")
                     if attempt == max_retries - 1:
                         raise e
+                    wait_time = min(_MAX_RETRY_WAIT, 2 ** attempt) + random.random()
+                
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(wait_time)
         
         raise Exception("Max retries exceeded for Claude API")
     
@@ -449,7 +449,8 @@ Make every improvement necessary to reach the quality target."""
             try:
                 await asyncio.sleep(2 * attempt)  # Progressive delay
                 
-                message = self.claude_client.messages.create(
+                message = await self._guarded_claude_call(
+                    self.claude_client.messages.create,
                     model="claude-3-5-sonnet-20241022",
                     max_tokens=max_tokens,
                     temperature=0.1,
@@ -843,70 +843,70 @@ async def generate_code_stream(project_id: str):
             contract_registry = APIContractRegistry(output_path)
             event_bus = HandlerEventBus()
             quality_coordinator = QualityCoordinator(contract_registry, event_bus)
-            documentation_manager = DocumentationManager(output_path)
-            
-            react_handler = ReactHandler(contract_registry, event_bus, claude_client)
-            node_handler = NodeHandler(contract_registry, event_bus, claude_client)
-            
-            yield f"data: {json.dumps({'type': 'progress', 'message': 'Generating backend files...'})}\n\n"
-            await asyncio.sleep(0.5)
-            
-            # Backend generation
-            backend_result = await node_handler.generate_code(features, context, 8.0)
-            
-            if backend_result.success:
-                # Stream backend files as they're generated
-                for file_path, content in backend_result.code_files.items():
-                    file_event = {
-                        'type': 'file_generated',
-                        'file_path': f"backend/{file_path}",
-                        'content': content,
-                        'timestamp': datetime.utcnow().isoformat()
-                    }
-                    yield f"data: {json.dumps(file_event)}\n\n"
-                    await asyncio.sleep(0.2)  # Small delay for real-time effect
+            with DocumentationManager(output_path) as documentation_manager:
+                
+                react_handler = ReactHandler(contract_registry, event_bus, claude_client)
+                node_handler = NodeHandler(contract_registry, event_bus, claude_client)
                 
-                yield f"data: {json.dumps({'type': 'progress', 'message': 'Generating frontend files...'})}\n\n"
+                yield f"data: {json.dumps({'type': 'progress', 'message': 'Generating backend files...'})}\n\n"
                 await asyncio.sleep(0.5)
                 
-                # Frontend generation
-                frontend_result = await react_handler.generate_code(features, context, 8.0)
+                # Backend generation
+                backend_result = await node_handler.generate_code(features, context, 8.0)
                 
-                if frontend_result.success:
-                    # Stream frontend files
-                    for file_path, content in frontend_result.code_files.items():
+                if backend_result.success:
+                    # Stream backend files as they're generated
+                    for file_path, content in backend_result.code_files.items():
                         file_event = {
                             'type': 'file_generated',
-                            'file_path': f"frontend/{file_path}",
+                            'file_path': f"backend/{file_path}",
                             'content': content,
                             'timestamp': datetime.utcnow().isoformat()
                         }
                         yield f"data: {json.dumps(file_event)}\n\n"
-                        await asyncio.sleep(0.2)
-                
-                yield f"data: {json.dumps({'type': 'progress', 'message': 'Finalizing project...'})}\n\n"
-                await asyncio.sleep(0.5)
-                
-                # Write files to disk
-                written_files = []
-                for file_path, content in backend_result.code_files.items():
-                    full_path = Path(output_path) / "backend" / file_path
-                    full_path.parent.mkdir(parents=True, exist_ok=True)
-                    full_path.write_text(content, encoding='utf-8')
-                    written_files.append(str(full_path))
-                
-                if frontend_result.success:
-                    for file_path, content in frontend_result.code_files.items():
-                        full_path = Path(output_path) / "frontend" / file_path
+                        await asyncio.sleep(0.2)  # Small delay for real-time effect
+                    
+                    yield f"data: {json.dumps({'type': 'progress', 'message': 'Generating frontend files...'})}\n\n"
+                    await asyncio.sleep(0.5)
+                    
+                    # Frontend generation
+                    frontend_result = await react_handler.generate_code(features, context, 8.0)
+                    
+                    if frontend_result.success:
+                        # Stream frontend files
+                        for file_path, content in frontend_result.code_files.items():
+                            file_event = {
+                                'type': 'file_generated',
+                                'file_path': f"frontend/{file_path}",
+                                'content': content,
+                                'timestamp': datetime.utcnow().isoformat()
+                            }
+                            yield f"data: {json.dumps(file_event)}\n\n"
+                            await asyncio.sleep(0.2)
+                    
+                    yield f"data: {json.dumps({'type': 'progress', 'message': 'Finalizing project...'})}\n\n"
+                    await asyncio.sleep(0.5)
+                    
+                    # Write files to disk
+                    written_files = []
+                    for file_path, content in backend_result.code_files.items():
+                        full_path = Path(output_path) / "backend" / file_path
                         full_path.parent.mkdir(parents=True, exist_ok=True)
                         full_path.write_text(content, encoding='utf-8')
                         written_files.append(str(full_path))
+                    
+                    if frontend_result.success:
+                        for file_path, content in frontend_result.code_files.items():
+                            full_path = Path(output_path) / "frontend" / file_path
+                            full_path.parent.mkdir(parents=True, exist_ok=True)
+                            full_path.write_text(content, encoding='utf-8')
+                            written_files.append(str(full_path))
+                    
+                    # Send completion event
+                    yield f"data: {json.dumps({'type': 'generation_complete', 'message': 'All files generated successfully', 'total_files': len(written_files)})}\n\n"
                 
-                # Send completion event
-                yield f"data: {json.dumps({'type': 'generation_complete', 'message': 'All files generated successfully', 'total_files': len(written_files)})}\n\n"
-            
-            else:
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Backend generation failed: {backend_result.error_message}'})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'type': 'error', 'message': f'Backend generation failed: {backend_result.error_message}'})}\n\n"
             
         except Exception as e:
             logger.error(f"❌ Stream generation error: {e}")
@@ -976,105 +976,105 @@ async def generate_ultra_premium_code(request: Request):
         contract_registry = APIContractRegistry(output_path)
         event_bus = HandlerEventBus()
         quality_coordinator = QualityCoordinator(contract_registry, event_bus)
-        documentation_manager = DocumentationManager(output_path)
-        
-        # Initialize handlers
-        react_handler = ReactHandler(contract_registry, event_bus, claude_client)
-        node_handler = NodeHandler(contract_registry, event_bus, claude_client)
-        
-        # Create context for handlers
-        context = {
-            "project_name": project_name,
-            "requirements": requirements,
-            "technology_stack": request_data["technology_stack"],
-            "features": features
-        }
-        
-        # Generate initial documentation
-        tech_stack = request_data["technology_stack"]
-        initial_readme = documentation_manager.generate_initial_readme(tech_stack, features, context)
-        documentation_manager.save_stage_documentation("initial", initial_readme, {
-            "stage": "initial",
-            "features": features,
-            "tech_stack": tech_stack
-        })
-        
-        logger.info(f"🚀 Starting coordinated generation with new architecture")
-        
-        # COORDINATED GENERATION (NEW)
-        handler_results = {}
-        
-        # Step 1: Backend handler generates first (establishes contracts)
-        logger.info("📝 Step 1: Backend handler generating contracts...")
-        backend_result = await node_handler.generate_code(features, context, 8.0)
-        handler_results["backend"] = backend_result
-        
-        if backend_result.success:
-            logger.info(f"✅ Backend generation completed: {backend_result.quality_score}/10")
+        with DocumentationManager(output_path) as documentation_manager:
             
-            # Update documentation after backend
-            updated_readme = documentation_manager.update_readme_after_handler_completion(
-                initial_readme, "backend", backend_result
-            )
-            documentation_manager.save_stage_documentation("backend-complete", updated_readme, {
-                "stage": "backend-complete",
-                "backend_result": {
-                    "quality_score": backend_result.quality_score,
-                    "files_count": len(backend_result.code_files),
-                    "contracts": backend_result.contracts
-                }
+            # Initialize handlers
+            react_handler = ReactHandler(contract_registry, event_bus, claude_client)
+            node_handler = NodeHandler(contract_registry, event_bus, claude_client)
+            
+            # Create context for handlers
+            context = {
+                "project_name": project_name,
+                "requirements": requirements,
+                "technology_stack": request_data["technology_stack"],
+                "features": features
+            }
+            
+            # Generate initial documentation
+            tech_stack = request_data["technology_stack"]
+            initial_readme = documentation_manager.generate_initial_readme(tech_stack, features, context)
+            documentation_manager.save_stage_documentation("initial", initial_readme, {
+                "stage": "initial",
+                "features": features,
+                "tech_stack": tech_stack
             })
-        else:
-            logger.error(f"❌ Backend generation failed: {backend_result.error_message}")
-            raise HTTPException(status_code=500, detail=f"Backend generation failed: {backend_result.error_message}")
-        
-        # Step 2: Frontend handler generates using established contracts
-        logger.info("🎨 Step 2: Frontend handler generating with contracts...")
-        frontend_result = await react_handler.generate_code(features, context, 8.0)
-        handler_results["frontend"] = frontend_result
-        
-        if frontend_result.success:
-            logger.info(f"✅ Frontend generation completed: {frontend_result.quality_score}/10")
-        else:
-            logger.warning(f"⚠️ Frontend generation issues: {frontend_result.error_message}")
-        
-        # Step 3: Cross-stack quality validation
-        logger.info("🔍 Step 3: Cross-stack quality validation...")
-        quality_report = await quality_coordinator.validate_and_refine(handler_results, 8.0)
-        
-        # Step 4: Write files to disk
-        logger.info("📁 Step 4: Writing files to disk...")
-        written_files = []
-        
-        # Write backend files
-        for file_path, content in backend_result.code_files.items():
-            full_path = Path(output_path) / "backend" / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text(content, encoding='utf-8')
-            written_files.append(str(full_path))
-        
-        # Write frontend files
-        if frontend_result.success:
-            for file_path, content in frontend_result.code_files.items():
-                full_path = Path(output_path) / "frontend" / file_path
+            
+            logger.info(f"🚀 Starting coordinated generation with new architecture")
+            
+            # COORDINATED GENERATION (NEW)
+            handler_results = {}
+            
+            # Step 1: Backend handler generates first (establishes contracts)
+            logger.info("📝 Step 1: Backend handler generating contracts...")
+            backend_result = await node_handler.generate_code(features, context, 8.0)
+            handler_results["backend"] = backend_result
+            
+            if backend_result.success:
+                logger.info(f"✅ Backend generation completed: {backend_result.quality_score}/10")
+                
+                # Update documentation after backend
+                updated_readme = documentation_manager.update_readme_after_handler_completion(
+                    initial_readme, "backend", backend_result
+                )
+                documentation_manager.save_stage_documentation("backend-complete", updated_readme, {
+                    "stage": "backend-complete",
+                    "backend_result": {
+                        "quality_score": backend_result.quality_score,
+                        "files_count": len(backend_result.code_files),
+                        "contracts": backend_result.contracts
+                    }
+                })
+            else:
+                logger.error(f"❌ Backend generation failed: {backend_result.error_message}")
+                raise HTTPException(status_code=500, detail=f"Backend generation failed: {backend_result.error_message}")
+            
+            # Step 2: Frontend handler generates using established contracts
+            logger.info("🎨 Step 2: Frontend handler generating with contracts...")
+            frontend_result = await react_handler.generate_code(features, context, 8.0)
+            handler_results["frontend"] = frontend_result
+            
+            if frontend_result.success:
+                logger.info(f"✅ Frontend generation completed: {frontend_result.quality_score}/10")
+            else:
+                logger.warning(f"⚠️ Frontend generation issues: {frontend_result.error_message}")
+            
+            # Step 3: Cross-stack quality validation
+            logger.info("🔍 Step 3: Cross-stack quality validation...")
+            quality_report = await quality_coordinator.validate_and_refine(handler_results, 8.0)
+            
+            # Step 4: Write files to disk
+            logger.info("📁 Step 4: Writing files to disk...")
+            written_files = []
+            
+            # Write backend files
+            for file_path, content in backend_result.code_files.items():
+                full_path = Path(output_path) / "backend" / file_path
                 full_path.parent.mkdir(parents=True, exist_ok=True)
                 full_path.write_text(content, encoding='utf-8')
                 written_files.append(str(full_path))
-        
-        # Step 5: Final documentation
-        logger.info("📚 Step 5: Updating final documentation...")
-        final_readme = documentation_manager.update_readme_with_completion(
-            handler_results, quality_report, written_files
-        )
-        documentation_manager.save_stage_documentation("completion", final_readme, {
-            "stage": "completion",
-            "quality_report": {
-                "overall_score": quality_report.overall_score,
-                "refinement_cycles": quality_report.refinement_cycles,
-                "critical_issues": len(quality_report.critical_issues)
-            },
-            "written_files": written_files
-        })
+            
+            # Write frontend files
+            if frontend_result.success:
+                for file_path, content in frontend_result.code_files.items():
+                    full_path = Path(output_path) / "frontend" / file_path
+                    full_path.parent.mkdir(parents=True, exist_ok=True)
+                    full_path.write_text(content, encoding='utf-8')
+                    written_files.append(str(full_path))
+            
+            # Step 5: Final documentation
+            logger.info("📚 Step 5: Updating final documentation...")
+            final_readme = documentation_manager.update_readme_with_completion(
+                handler_results, quality_report, written_files
+            )
+            documentation_manager.save_stage_documentation("completion", final_readme, {
+                "stage": "completion",
+                "quality_report": {
+                    "overall_score": quality_report.overall_score,
+                    "refinement_cycles": quality_report.refinement_cycles,
+                    "critical_issues": len(quality_report.critical_issues)
+                },
+                "written_files": written_files
+            })
         
         # RETURN SAME FORMAT AS BEFORE (n8n compatibility)
         response = {
@@ -1189,5 +1189,6 @@ if __name__ == "__main__":
         host="0.0.0.0", 
         port=8004,
         reload=False,
-        log_level="info"
+        log_level="info",
+        loop="auto"  # uvloop when installed, stock asyncio otherwise
     )
\ No newline at end of file
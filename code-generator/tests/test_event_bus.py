@@ -0,0 +1,43 @@
+"""
+Event bus delivery tests (run from code-generator: python -m unittest discover tests)
+"""
+
+import asyncio
+import unittest
+
+from src.core.event_bus import HandlerEventBus
+
+
+class EventBusDeliveryTest(unittest.IsolatedAsyncioTestCase):
+    """Every published event reaches its subscribers, whatever the loop's task factory"""
+
+    async def _publish_and_collect(self, suspend: bool):
+        bus = HandlerEventBus()
+        received = []
+
+        async def callback(event):
+            if suspend:
+                await asyncio.sleep(0)
+            received.append(event.data["n"])
+
+        bus.subscribe("tick", callback, "test")
+        for n in range(5):
+            await bus.publish("tick", {"n": n})
+        await asyncio.wait_for(bus.flush(), timeout=5)
+
+        self.assertEqual(received, list(range(5)))
+        self.assertTrue(all(s.consumer is None and not s.queue for s in bus.subscribers["tick"]))
+
+    async def test_delivers_all_events(self):
+        await self._publish_and_collect(suspend=False)
+        await self._publish_and_collect(suspend=True)
+
+    @unittest.skipUnless(hasattr(asyncio, "eager_task_factory"), "eager tasks need Python 3.12+")
+    async def test_delivers_all_events_under_eager_task_factory(self):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        await self._publish_and_collect(suspend=False)
+        await self._publish_and_collect(suspend=True)
+
+
+if __name__ == "__main__":
+    unittest.main()